@@ -9,6 +9,7 @@ from quizgen import (
     AnswerGenerator,
     ContentAnalyzer,
     DocumentProcessor,
+    LatencyBudget,
     QuizConfig,
     QuizFormatter,
     QuestionGenerator,
@@ -26,6 +27,11 @@ def build_arg_parser() -> argparse.ArgumentParser:
     p.add_argument("--out", type=str, default="quiz.json")
     p.add_argument("--format", choices=["json", "text", "pdf"], default="json")
     p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--workers", type=int, default=0, help="Worker pool size for analysis and question building (0 = serial)")
+    p.add_argument("--time-budget", type=float, default=None,
+                   help="Latency budget in seconds; stages degrade to stay within it")
+    p.add_argument("--wordnet-index", type=str, default=None,
+                   help="WordNet index built with `python -m quizgen.wordnet_index --out PATH`")
     return p
 
 
@@ -39,18 +45,22 @@ def main() -> None:
         num_short_answer=args.num_short,
         output_format=args.format,
         random_seed=args.seed,
+        parallel_workers=args.workers,
+        time_budget_seconds=args.time_budget,
+        wordnet_index_path=args.wordnet_index,
     )
 
     processor = DocumentProcessor()
     preprocessor = TextPreprocessor()
     analyzer = ContentAnalyzer(preprocessor)
-    generator = QuestionGenerator(random_seed=args.seed)
+    generator = QuestionGenerator(random_seed=args.seed, wordnet_index_path=config.wordnet_index_path)
     formatter = QuizFormatter()
+    budget = LatencyBudget(config.time_budget_seconds)
 
-    document = processor.extract_text(args.input)
-    processed = preprocessor.process(document.text)
-    concepts = analyzer.extract_concepts(processed)
-    questions = generator.create_questions(concepts, config)
+    document = processor.extract_text(args.input, budget=budget)
+    processed = preprocessor.process(document.text, workers=args.workers, budget=budget)
+    concepts = analyzer.extract_concepts(processed, workers=args.workers, budget=budget)
+    questions = generator.create_questions(concepts, config, budget=budget)
 
     out_path = Path(args.out)
     if args.format == "json":
@@ -61,6 +71,8 @@ def main() -> None:
         formatter.to_pdf(questions, out_path)
 
     print(f"Saved quiz to: {out_path.resolve()}")
+    if budget.degradations:
+        print(f"Degraded to meet the time budget: {', '.join(budget.degradations)}")
 
 
 if __name__ == "__main__":
@@ -1,11 +1,32 @@
-from .config import QuizConfig
-from .document_processor import DocumentProcessor
-from .nlp_utils import TextPreprocessor
-from .text_analyzer import ContentAnalyzer
-from .question_generator import QuestionGenerator
-from .difficulty_assessor import DifficultyAssessor
-from .answer_generator import AnswerGenerator
-from .quiz_formatter import QuizFormatter
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
+# Public names resolve on first access so that importing the package (or a
+# light submodule such as the formatter) does not pull in NLTK or spaCy.
+_LAZY_EXPORTS = {
+    "QuizConfig": ".config",
+    "DocumentProcessor": ".document_processor",
+    "TextPreprocessor": ".nlp_utils",
+    "ContentAnalyzer": ".text_analyzer",
+    "QuestionGenerator": ".question_generator",
+    "DifficultyAssessor": ".difficulty_assessor",
+    "AnswerGenerator": ".answer_generator",
+    "QuizFormatter": ".quiz_formatter",
+    "LatencyBudget": ".budget",
+}
+
+if TYPE_CHECKING:
+    from .config import QuizConfig
+    from .document_processor import DocumentProcessor
+    from .nlp_utils import TextPreprocessor
+    from .text_analyzer import ContentAnalyzer
+    from .question_generator import QuestionGenerator
+    from .difficulty_assessor import DifficultyAssessor
+    from .answer_generator import AnswerGenerator
+    from .quiz_formatter import QuizFormatter
+    from .budget import LatencyBudget
 
 __all__ = [
     "QuizConfig",
@@ -16,4 +37,18 @@ __all__ = [
     "DifficultyAssessor",
     "AnswerGenerator",
     "QuizFormatter",
-]
\ No newline at end of file
+    "LatencyBudget",
+]
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
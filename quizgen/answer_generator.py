@@ -2,25 +2,25 @@ from __future__ import annotations
 
 import random
 from dataclasses import dataclass
-from typing import List, Optional
+from pathlib import Path
+from typing import Iterable, List, Optional
 
-from nltk.corpus import wordnet as wn
+from .wordnet_index import load_wordnet_index
 
 
 class AnswerGenerator:
-    def __init__(self, random_seed: int = 42) -> None:
-        random.seed(random_seed)
+    def __init__(self, random_seed: int = 42, wordnet_index_path: Optional[str | Path] = None) -> None:
+        self.random_seed = random_seed
+        self.rng = random.Random(random_seed)
+        # Precompiled index from `python -m quizgen.wordnet_index`; NLTK is used when it is absent
+        self.wordnet_index_path = wordnet_index_path
 
     def generate_distractors_from_wordnet(self, term: str, max_distractors: int = 3) -> List[str]:
         term = term.replace(" ", "_")
         distractors: List[str] = []
-        try:
-            synsets = wn.synsets(term)
-        except LookupError:
-            synsets = []
-        for syn in synsets:
-            for lemma in syn.lemmas():
-                candidate = lemma.name().replace("_", " ")
+        for lemma_names in self._wordnet_synset_lemmas(term):
+            for name in lemma_names:
+                candidate = name.replace("_", " ")
                 if candidate.lower() != term.lower() and candidate not in distractors:
                     distractors.append(candidate)
                 if len(distractors) >= max_distractors:
@@ -29,14 +29,41 @@ class AnswerGenerator:
                 break
         return distractors
 
-    def generate_numeric_distractors(self, correct: str, max_distractors: int = 3) -> List[str]:
+    def ensure_wordnet_loaded(self) -> None:
+        # NLTK's lazy corpus loader swaps its own __class__/__dict__ on first
+        # access, which is not thread-safe; call this before fanning out
+        if load_wordnet_index(self.wordnet_index_path) is not None:
+            return
+        from nltk.corpus import wordnet as wn
+        try:
+            wn.ensure_loaded()
+        except LookupError:
+            pass
+
+    def _wordnet_synset_lemmas(self, term: str) -> Iterable[List[str]]:
+        index = load_wordnet_index(self.wordnet_index_path)
+        if index is not None:
+            return index.synset_lemma_names(term)
+        # Deferred: loading the WordNet corpus reader costs seconds at import
+        from nltk.corpus import wordnet as wn
+        try:
+            synsets = wn.synsets(term)
+        except LookupError:
+            synsets = []
+        return ([lemma.name() for lemma in syn.lemmas()] for syn in synsets)
+
+    def generate_numeric_distractors(self,
+                                     correct: str,
+                                     max_distractors: int = 3,
+                                     rng: Optional[random.Random] = None) -> List[str]:
+        rng = rng or self.rng
         try:
             value = float(correct)
         except ValueError:
             return []
         # Simple perturbations
         offsets = [-1, +1, -10, +10, -0.5, +0.5]
-        random.shuffle(offsets)
+        rng.shuffle(offsets)
         distractors = []
         for off in offsets:
             candidate = value + off
@@ -50,12 +77,15 @@ class AnswerGenerator:
                                    pool_terms: List[str], 
                                    named_entities: List[str],
                                    numerical_facts: List[str],
-                                   max_options: int = 4) -> List[str]:
+                                   max_options: int = 4,
+                                   rng: Optional[random.Random] = None,
+                                   use_wordnet: bool = True) -> List[str]:
         distractors: List[str] = []
-        if correct_answer.isdigit() or self._looks_numeric(correct_answer):
-            distractors.extend(self.generate_numeric_distractors(correct_answer, max_options - 1))
+        if not self.uses_wordnet(correct_answer):
+            distractors.extend(self.generate_numeric_distractors(correct_answer, max_options - 1, rng=rng))
         else:
-            distractors.extend(self.generate_distractors_from_wordnet(correct_answer, max_options - 1))
+            if use_wordnet:
+                distractors.extend(self.generate_distractors_from_wordnet(correct_answer, max_options - 1))
             # Add entity-based distractors
             for ent in named_entities:
                 if ent.lower() != correct_answer.lower() and ent not in distractors:
@@ -71,6 +101,10 @@ class AnswerGenerator:
         # Trim to desired length
         return distractors[: max_options - 1]
 
+    def uses_wordnet(self, correct_answer: str) -> bool:
+        # Numeric answers get perturbed numbers, everything else WordNet lemmas
+        return not (correct_answer.isdigit() or self._looks_numeric(correct_answer))
+
     def _looks_numeric(self, text: str) -> bool:
         try:
             float(text)
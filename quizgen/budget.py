@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import math
+import time
+from typing import Callable, List, Optional
+
+# Share of the budget left at the start of a stage that the stage may spend
+EXTRACTION_SHARE = 0.3
+TOKENIZE_SHARE = 0.35
+ANALYSIS_SHARE = 0.5
+
+# Sentence stages check the clock between batches of this many sentences, so
+# at least one batch is always processed
+SENTENCE_BATCH = 256
+
+# NER is skipped when the remaining budget cannot cover this throughput
+NER_CHARS_PER_SECOND = 50_000
+
+# WordNet lookups stop (pool terms are used instead) below this much budget
+WORDNET_RESERVE_SECONDS = 0.5
+
+# Degradation names reported in LatencyBudget.degradations
+SAMPLED_PAGES = "sampled_pages"
+TRUNCATED_EXTRACTION = "truncated_extraction"
+CAPPED_SENTENCES = "capped_sentences"
+SKIPPED_NER = "skipped_ner"
+POOL_TERM_DISTRACTORS = "pool_term_distractors"
+
+
+class LatencyBudget:
+    def __init__(self, seconds: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        # seconds=None means no budget: nothing is ever degraded
+        self.seconds = seconds
+        self.clock = clock
+        self.started = clock()
+        self.degradations: List[str] = []
+
+    def elapsed(self) -> float:
+        return self.clock() - self.started
+
+    def remaining(self) -> float:
+        if self.seconds is None:
+            return math.inf
+        return max(0.0, self.seconds - self.elapsed())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def deadline(self, share: float = 1.0) -> float:
+        # Clock value by which a stage allowed `share` of what is left must finish
+        return self.clock() + self.remaining() * share
+
+    def degrade(self, name: str) -> None:
+        if name not in self.degradations:
+            self.degradations.append(name)
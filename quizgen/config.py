@@ -26,4 +26,17 @@ class QuizConfig:
     output_format: str = "json"  # json|text|pdf
 
     # Random seed for reproducibility
-    random_seed: int = 42
\ No newline at end of file
+    random_seed: int = 42
+
+    # Question building fan-out (0 = serial); output is identical either way
+    parallel_workers: int = 0
+    parallel_backend: str = "thread"  # thread|process
+
+    # Latency budget in seconds for the whole pipeline (None = unlimited);
+    # stages degrade (page sampling, no NER, pool-term distractors, fewer
+    # sentences) to stay within it
+    time_budget_seconds: Optional[float] = None
+
+    # Precompiled WordNet index (`python -m quizgen.wordnet_index --out PATH`);
+    # None uses $QUIZGEN_WORDNET_INDEX, else the file inside the package
+    wordnet_index_path: Optional[str] = None
@@ -1,10 +1,30 @@
 from __future__ import annotations
 
 import io
+import math
 import re
+import zipfile
 from dataclasses import dataclass
+from html.parser import HTMLParser
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional, Set, TypeVar
+from xml.etree import ElementTree
+
+from .budget import EXTRACTION_SHARE, SAMPLED_PAGES, TRUNCATED_EXTRACTION, LatencyBudget
+
+_T = TypeVar("_T")
+
+_PAGE_LABEL_RE = re.compile(r"^Page\s+\d+", flags=re.IGNORECASE)
+_DIGITS_RE = re.compile(r"\d+")
+_SPACES_RE = re.compile(r"\s+")
+
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_P = _W_NS + "p"
+_W_R = _W_NS + "r"
+_W_T = _W_NS + "t"
+_W_TAB = _W_NS + "tab"
+_W_BREAKS = frozenset({_W_NS + "br", _W_NS + "cr"})
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
 
 
 @dataclass
@@ -13,33 +33,146 @@ class Document:
     text: str
 
 
-class DocumentProcessor:
+def _evenly_spaced(items: List[_T], count: int) -> List[_T]:
+    if count >= len(items):
+        return items
+    if count <= 0:
+        return []
+    step = len(items) / count
+    return [items[int(i * step)] for i in range(count)]
+
+
+class _HTMLTextCollector(HTMLParser):
+    # Collects text nodes as they are parsed, skipping anything inside a
+    # suppressed element; no tree is built. feed() may hand over a text node
+    # in several pieces, so pieces are joined until the next markup event.
+    SUPPRESSED_TAGS = frozenset({"script", "style", "nav"})
+    VOID_TAGS = frozenset({
+        "area", "base", "br", "col", "embed", "hr", "img", "input",
+        "link", "meta", "param", "source", "track", "wbr",
+    })
+    # Opening one of these directly inside a <nav> whose earlier child has
+    # already closed means the page forgot </nav>
+    NAV_END_TAGS = frozenset({"main", "article", "section", "p", "h1", "h2", "h3", "h4", "h5", "h6"})
+
     def __init__(self) -> None:
-        pass
+        super().__init__(convert_charrefs=True)
+        self.blocks: List[str] = []
+        self._pending: List[str] = []
+        # Open elements from the outermost suppressed one inward; elements
+        # outside it are not tracked, so unclosed <p>/<li> cost nothing
+        self._suppressed: List[str] = []
+        self._nav_child_closed = False
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        self._flush()
+        if tag in self.VOID_TAGS:
+            return
+        if self._suppressed:
+            if self._suppressed == ["nav"] and self._nav_child_closed and tag in self.NAV_END_TAGS:
+                self._suppressed.clear()
+            else:
+                self._suppressed.append(tag)
+                return
+        if tag in self.SUPPRESSED_TAGS:
+            self._suppressed.append(tag)
+            self._nav_child_closed = False
+
+    def handle_startendtag(self, tag: str, attrs) -> None:
+        # Self-closing <nav/> etc. has no content to suppress
+        self._flush()
+
+    def handle_endtag(self, tag: str) -> None:
+        self._flush()
+        if not self._suppressed:
+            return
+        # Close the innermost open element of this name along with anything
+        # left unclosed inside it. An end tag for nothing open in here closes
+        # an element around the suppressed one, so suppression ends with it.
+        for idx in range(len(self._suppressed) - 1, -1, -1):
+            if self._suppressed[idx] == tag:
+                break
+        else:
+            idx = 0
+        del self._suppressed[idx:]
+        if idx == 1:
+            self._nav_child_closed = True
+
+    def handle_data(self, data: str) -> None:
+        if not self._suppressed:
+            self._pending.append(data)
+
+    def handle_comment(self, data: str) -> None:
+        self._flush()
+
+    def handle_decl(self, decl: str) -> None:
+        self._flush()
+
+    def close(self) -> None:
+        super().close()
+        self._flush()
+
+    def _flush(self) -> None:
+        if self._pending:
+            block = "".join(self._pending)
+            self._pending.clear()
+            if block.strip():
+                self.blocks.append(block)
+
+
+class DocumentProcessor:
+    def __init__(self, header_footer_lines: int = 3, repeated_line_fraction: float = 0.5) -> None:
+        # Running headers/footers: a line among the first/last `header_footer_lines`
+        # non-empty lines of a page that recurs on at least `repeated_line_fraction`
+        # of the pages is dropped
+        self.header_footer_lines = header_footer_lines
+        self.repeated_line_fraction = repeated_line_fraction
 
-    def extract_text(self, file_path: str | Path) -> Document:
+    def extract_text(self, file_path: str | Path, budget: Optional[LatencyBudget] = None) -> Document:
             path = Path(file_path)
             if not path.exists():
                 raise FileNotFoundError(f"File not found: {path}")
 
+            # Reading and cleanup share one extraction deadline
+            deadline = budget.deadline(EXTRACTION_SHARE) if budget is not None else None
             suffix = path.suffix.lower()
             if suffix == ".pdf":
-                text = self._extract_pdf_text(path)
-            elif suffix in (".docx",):
-                text = self._extract_docx_text(path)
-            elif suffix in (".txt",):
-                text = path.read_text(encoding="utf-8", errors="ignore")
-            elif suffix in (".html", ".htm"): 
-                text = self._extract_html_text(path)
+                pages: Iterable[str] = self.iter_pdf_pages(path, budget=budget)
             else:
-                # Fallback: try reading as UTF-8 text
-                text = path.read_text(encoding="utf-8", errors="ignore")
+                pages = [self._extract_single_page_text(path, suffix, budget)]
 
-            text = self._strip_headers_footers(text)
-            text = self._normalize_whitespace(text)
+            # Lines are normalized one at a time (the same result as normalizing
+            # the joined text) so cleanup can stop at the deadline too
+            lines = (self._normalize_whitespace(line) for line in self._iter_clean_lines(pages))
+            text = " ".join(line for line in self._until_deadline(lines, budget, deadline) if line)
             return Document(path=path, text=text)
 
-    def _extract_pdf_text(self, path: Path) -> str:
+    def _extract_single_page_text(self, path: Path, suffix: str,
+                                  budget: Optional[LatencyBudget] = None) -> str:
+        if suffix in (".docx",):
+            text = self._extract_docx_text(path, budget)
+        elif suffix in (".html", ".htm"):
+            text = self._extract_html_text(path, budget)
+        else:
+            # .txt, and the fallback for anything else: read as UTF-8 text
+            text = "".join(self._until_deadline(self.iter_text_chunks(path), budget))
+        return text
+
+    def _until_deadline(self, blocks: Iterable[_T], budget: Optional[LatencyBudget],
+                        deadline: Optional[float] = None) -> Iterator[_T]:
+        # Streamed blocks, cut off once the extraction share of the budget is spent
+        if budget is None:
+            yield from blocks
+            return
+        if deadline is None:
+            deadline = budget.deadline(EXTRACTION_SHARE)
+        for block in blocks:
+            yield block
+            if budget.clock() >= deadline:
+                budget.degrade(TRUNCATED_EXTRACTION)
+                return
+
+    def iter_pdf_pages(self, path: str | Path, budget: Optional[LatencyBudget] = None) -> Iterator[str]:
         try:
             import pdfplumber
         except Exception as exc:
@@ -47,51 +180,158 @@ class DocumentProcessor:
                 "pdfplumber is required to extract text from PDFs. Install with `pip install pdfplumber`."
             ) from exc
 
-        pages_text: List[str] = []
         with pdfplumber.open(str(path)) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text() or ""
-                pages_text.append(page_text)
-        return "\n".join(pages_text)
+            pages = pdf.pages
+            order = list(range(len(pages)))
+            if budget is not None:
+                deadline = budget.deadline(EXTRACTION_SHARE)
+                started = budget.clock()
+            pos = 0
+            while pos < len(order):
+                page = pages[order[pos]]
+                pos += 1
+                yield page.extract_text() or ""
+                # Drop the page's parsed layout objects once its text is out
+                page.flush_cache()
+                if budget is None or pos == len(order):
+                    continue
+                # If the pages left will not fit at the observed per-page rate,
+                # keep an evenly spaced sample of them that does
+                now = budget.clock()
+                per_page = (now - started) / pos
+                left = order[pos:]
+                if per_page * len(left) > deadline - now:
+                    affordable = int(max(0.0, deadline - now) / per_page) if per_page > 0 else len(left)
+                    order = order[:pos] + _evenly_spaced(left, affordable)
+                    budget.degrade(SAMPLED_PAGES)
 
-    def _extract_docx_text(self, path: Path) -> str:
-        try:
-            import docx  # python-docx
-        except Exception as exc:
-            raise RuntimeError(
-                "python-docx is required to extract text from .docx files. Install with `pip install python-docx`."
-            ) from exc
+    def _extract_docx_text(self, path: Path, budget: Optional[LatencyBudget] = None) -> str:
+        return "\n".join(self._until_deadline(self.iter_docx_text(path), budget))
 
-        document = docx.Document(str(path))
-        paragraphs = [p.text for p in document.paragraphs]
-        return "\n".join(paragraphs)
+    def iter_docx_text(self, path: str | Path) -> Iterator[str]:
+        # Stream word/document.xml out of the archive and yield each paragraph,
+        # including the ones inside table cells, in document order. Every
+        # finished element outside an open paragraph (paragraphs, rows, cells,
+        # properties...) is detached from its parent so memory does not grow.
+        with zipfile.ZipFile(path) as archive, archive.open("word/document.xml") as xml:
+            stack: List[ElementTree.Element] = []
+            paragraph_depth = 0
+            fallback_depth = 0
+            for event, elem in ElementTree.iterparse(xml, events=("start", "end")):
+                if event == "start":
+                    stack.append(elem)
+                    if elem.tag == _W_P:
+                        paragraph_depth += 1
+                    elif elem.tag == _MC_FALLBACK:
+                        fallback_depth += 1
+                    continue
+                stack.pop()
+                if elem.tag == _W_P:
+                    paragraph_depth -= 1
+                    if not fallback_depth:
+                        yield self._docx_paragraph_text(elem)
+                elif elem.tag == _MC_FALLBACK:
+                    # Alternate rendering of content already read from mc:Choice
+                    fallback_depth -= 1
+                elif paragraph_depth:
+                    # Runs and their children are read when the paragraph ends
+                    continue
+                if stack:
+                    stack[-1].remove(elem)
+                else:
+                    elem.clear()
 
-    def _extract_html_text(self, path: Path) -> str:
-        try:
-            from bs4 import BeautifulSoup
-        except Exception as exc:
-            raise RuntimeError(
-                "beautifulsoup4 is required for HTML parsing. Install with `pip install beautifulsoup4`."
-            ) from exc
+    def _docx_paragraph_text(self, paragraph: ElementTree.Element) -> str:
+        # Same run text rules as python-docx's Paragraph.text: only a run's own
+        # children count, so w:pPr tab stops (also w:tab) add nothing
+        parts: List[str] = []
+        for run in paragraph.iter(_W_R):
+            for node in run:
+                if node.tag == _W_T:
+                    parts.append(node.text or "")
+                elif node.tag == _W_TAB:
+                    parts.append("\t")
+                elif node.tag in _W_BREAKS:
+                    parts.append("\n")
+        return "".join(parts)
+
+    def _extract_html_text(self, path: Path, budget: Optional[LatencyBudget] = None) -> str:
+        return " ".join(self._until_deadline(self.iter_html_text(path), budget))
+
+    def iter_html_text(self, path: str | Path, chunk_size: int = 1 << 16) -> Iterator[str]:
+        # Feed the file to the parser chunk by chunk and hand text blocks out as
+        # soon as they are complete, so memory does not grow with file size
+        parser = _HTMLTextCollector()
+        with open(path, "r", encoding="utf-8", errors="ignore") as handle:
+            while True:
+                chunk = handle.read(chunk_size)
+                if not chunk:
+                    break
+                parser.feed(chunk)
+                if parser.blocks:
+                    yield from parser.blocks
+                    parser.blocks.clear()
+        parser.close()
+        yield from parser.blocks
+        parser.blocks.clear()
+
+    def iter_text_chunks(self, path: str | Path, chunk_size: int = 1 << 16) -> Iterator[str]:
+        with open(path, "r", encoding="utf-8", errors="ignore") as handle:
+            while True:
+                chunk = handle.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def _strip_headers_footers(self, pages: Iterable[str]) -> str:
+        return "\n".join(self._iter_clean_lines(pages))
+
+    def _iter_clean_lines(self, pages: Iterable[str]) -> Iterator[str]:
+        # Pages can come from any extraction path (streamed or collected out of
+        # order); repeat counts only depend on the set of pages
+        page_lines = [page.splitlines() for page in pages]
+        if len(page_lines) > 1:
+            edges = [self._edge_line_indices(lines) for lines in page_lines]
+            repeated = self._find_repeated_edge_lines(page_lines, edges)
+        else:
+            edges, repeated = [set()] * len(page_lines), set()
+
+        for lines, edge in zip(page_lines, edges):
+            for idx, line in enumerate(lines):
+                line_stripped = line.strip()
+                # Heuristic removal of page numbers
+                if _DIGITS_RE.fullmatch(line_stripped):
+                    continue
+                if _PAGE_LABEL_RE.match(line_stripped):
+                    continue
+                if repeated and idx in edge and self._edge_line_key(line_stripped) in repeated:
+                    continue
+                yield line
+
+    def _edge_line_indices(self, lines: List[str]) -> Set[int]:
+        k = self.header_footer_lines
+        if k <= 0:
+            return set()
+        non_empty = [idx for idx, line in enumerate(lines) if line.strip()]
+        # On a page with at most 2k lines the windows overlap; lines in both
+        # are the page's body, not a header or footer
+        return set(non_empty[:k]) ^ set(non_empty[-k:])
+
+    def _edge_line_key(self, line: str) -> str:
+        # Page-dependent numbers ("Chapter 2 - page 14") should not break a match
+        return _SPACES_RE.sub(" ", _DIGITS_RE.sub("#", line)).lower()
 
-        html = path.read_text(encoding="utf-8", errors="ignore")
-        soup = BeautifulSoup(html, "html.parser")
-        for script in soup(["script", "style"]):
-            script.decompose()
-        return soup.get_text(" ")
-
-    def _strip_headers_footers(self, text: str) -> str:
-        # Heuristic removal of page numbers / headers / footers
-        lines = text.splitlines()
-        cleaned: List[str] = []
-        for line in lines:
-            line_stripped = line.strip()
-            if re.fullmatch(r"\d+", line_stripped):
-                continue
-            if re.match(r"^Page\s+\d+", line_stripped, flags=re.IGNORECASE):
-                continue
-            cleaned.append(line)
-        return "\n".join(cleaned)
+    def _find_repeated_edge_lines(self, page_lines: List[List[str]], edges: List[Set[int]]) -> Set[str]:
+        num_pages = len(page_lines)
+        if num_pages < 2:
+            return set()
+        counts: Dict[str, int] = {}
+        for lines, edge in zip(page_lines, edges):
+            # Count each line once per page
+            for key in {self._edge_line_key(lines[idx].strip()) for idx in edge}:
+                counts[key] = counts.get(key, 0) + 1
+        threshold = max(2, math.ceil(self.repeated_line_fraction * num_pages))
+        return {key for key, count in counts.items() if count >= threshold}
 
     def _normalize_whitespace(self, text: str) -> str:
         text = re.sub(r"\u00A0", " ", text)
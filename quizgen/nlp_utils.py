@@ -1,12 +1,21 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
-from typing import List, Optional
+from array import array
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
 
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import sent_tokenize, word_tokenize
+from .budget import CAPPED_SENTENCES, SENTENCE_BATCH, TOKENIZE_SHARE, LatencyBudget
+
+# NLTK and spaCy are imported on first use rather than at module import: both
+# take seconds to load and many callers (CLI --help, formatter-only use) never
+# touch them.
+_UNLOADED: Any = object()
+
+# Where a budgeted run may cut the text before sentence splitting
+_PIECE_END_RE = re.compile(r"[.!?]\s+")
+_PIECE_SPACE_RE = re.compile(r"\s+")
 
 
 @dataclass
@@ -14,32 +23,219 @@ class ProcessedText:
     sentences: List[str]
     tokens_by_sentence: List[List[str]]
 
+    def interned(self, vocabulary: Optional[Vocabulary] = None) -> InternedText:
+        vocabulary = vocabulary if vocabulary is not None else Vocabulary()
+        token_ids = [vocabulary.encode(tokens) for tokens in self.tokens_by_sentence]
+        return InternedText(sentences=self.sentences, vocabulary=vocabulary, token_ids=token_ids)
+
+
+# Bigram keys pack two token ids into one int: the left id (offset by one so
+# every bigram key is >= 2**32) in the high bits, the right id in the low bits.
+# Unigram keys are the plain token ids, so both share one key space.
+BIGRAM_SHIFT = 32
+_LOW_MASK = (1 << BIGRAM_SHIFT) - 1
+
+
+def pack_bigram(left: int, right: int) -> int:
+    return ((left + 1) << BIGRAM_SHIFT) | right
+
+
+def unpack_bigram(key: int) -> tuple[int, int]:
+    return (key >> BIGRAM_SHIFT) - 1, key & _LOW_MASK
+
+
+def is_bigram_key(key: int) -> bool:
+    return key > _LOW_MASK
+
+
+@dataclass
+class Vocabulary:
+    terms: List[str] = field(default_factory=list)
+    ids: Dict[str, int] = field(default_factory=dict)
+
+    def intern(self, token: str) -> int:
+        token_id = self.ids.get(token)
+        if token_id is None:
+            token_id = len(self.terms)
+            self.ids[token] = token_id
+            self.terms.append(token)
+        return token_id
+
+    def encode(self, tokens: List[str]) -> array:
+        return array("q", [self.intern(t) for t in tokens])
+
+    def decode(self, token_ids) -> List[str]:
+        terms = self.terms
+        return [terms[i] for i in token_ids]
+
+    def term_for_key(self, key: int) -> str:
+        if is_bigram_key(key):
+            left, right = unpack_bigram(key)
+            return f"{self.terms[left]} {self.terms[right]}"
+        return self.terms[key]
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+
+@dataclass
+class InternedText:
+    """ProcessedText variant holding each sentence's tokens as an int array."""
+
+    sentences: List[str]
+    vocabulary: Vocabulary
+    token_ids: List[array]
+
+    @property
+    def tokens_by_sentence(self) -> List[List[str]]:
+        # Decoded on demand for callers written against ProcessedText
+        return [self.vocabulary.decode(ids) for ids in self.token_ids]
+
+    def term_keys_by_sentence(self) -> Iterator[array]:
+        # Unigram ids followed by packed bigram keys, mirroring the
+        # "tokens + bigrams" documents built from string tokens
+        for ids in self.token_ids:
+            keys = array("q", ids)
+            keys.extend(pack_bigram(ids[i], ids[i + 1]) for i in range(len(ids) - 1))
+            yield keys
+
+
+def _text_pieces(text: str, piece_size: int = 1 << 16) -> Iterator[str]:
+    # Pieces end after sentence-final punctuation where there is some, so
+    # splitting them gives the whole-text sentences except across the rare
+    # punctuation the splitter would not break at ("e.g. ")
+    start = 0
+    while start < len(text):
+        end = start + piece_size
+        if end < len(text):
+            boundary = _PIECE_END_RE.search(text, end, end + piece_size) or _PIECE_SPACE_RE.search(text, end)
+            end = boundary.end() if boundary else len(text)
+        yield text[start:end]
+        start = end
+
+
+def shard_ranges(count: int, shards: int) -> List[Tuple[int, int]]:
+    # Contiguous, in-order [start, end) ranges covering range(count)
+    shards = max(1, min(shards, count))
+    size, extra = divmod(count, shards)
+    ranges = []
+    start = 0
+    for i in range(shards):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
 
 class TextPreprocessor:
     def __init__(self, language_code: str = "english") -> None:
         self.language_code = language_code
-        try:
-            self.stop_words = set(stopwords.words(language_code))
-        except LookupError:
-            self.stop_words = set()
+        self._stop_words: Optional[Set[str]] = None
+        self._spacy_nlp: Any = _UNLOADED
+
+    @property
+    def stop_words(self) -> Set[str]:
+        if self._stop_words is None:
+            from nltk.corpus import stopwords
+            try:
+                self._stop_words = set(stopwords.words(self.language_code))
+            except LookupError:
+                self._stop_words = set()
+        return self._stop_words
 
+    @property
+    def spacy_nlp(self):
         # Optional spaCy support
-        self.spacy_nlp = None
-        try:
-            import spacy
+        if self._spacy_nlp is _UNLOADED:
+            self._spacy_nlp = None
             try:
-                self.spacy_nlp = spacy.load("en_core_web_sm")
+                import spacy
+                try:
+                    self._spacy_nlp = spacy.load("en_core_web_sm")
+                except Exception:
+                    self._spacy_nlp = spacy.blank("en")
             except Exception:
-                self.spacy_nlp = spacy.blank("en")
-        except Exception:
-            self.spacy_nlp = None
+                self._spacy_nlp = None
+        return self._spacy_nlp
+
+    def __getstate__(self):
+        # Worker processes only tokenize; the spaCy pipeline is reloaded lazily if needed
+        state = self.__dict__.copy()
+        del state["_spacy_nlp"]
+        return state
 
-    def process(self, text: str) -> ProcessedText:
-        sentences = self._sentence_tokenize(text)
-        tokens_by_sentence = [self._word_tokenize(s) for s in sentences]
+    def __setstate__(self, state) -> None:
+        self.__dict__.update(state)
+        self._spacy_nlp = _UNLOADED
+
+    def process(self, text: str, workers: int = 0, budget: Optional[LatencyBudget] = None) -> ProcessedText:
+        sentences, tokens_by_sentence = self._tokenize_text(text, workers, budget)
         return ProcessedText(sentences=sentences, tokens_by_sentence=tokens_by_sentence)
 
+    def process_interned(self, text: str, vocabulary: Optional[Vocabulary] = None,
+                         workers: int = 0, budget: Optional[LatencyBudget] = None) -> InternedText:
+        vocabulary = vocabulary if vocabulary is not None else Vocabulary()
+        # Interning stays in this process so ids are assigned in document order
+        sentences, tokens_by_sentence = self._tokenize_text(text, workers, budget)
+        token_ids = [vocabulary.encode(tokens) for tokens in tokens_by_sentence]
+        return InternedText(sentences=sentences, vocabulary=vocabulary, token_ids=token_ids)
+
+    def _tokenize_text(self, text: str, workers: int = 0,
+                       budget: Optional[LatencyBudget] = None) -> Tuple[List[str], List[List[str]]]:
+        if workers <= 0 or not _PIECE_END_RE.search(text):
+            # A text without a sentence break is one sentence: no pool needed
+            return self._tokenize_in_rounds(text, self._word_tokenize_many, budget, 1)
+        from concurrent.futures import ProcessPoolExecutor
+
+        _ = self.stop_words  # loaded once here rather than in every worker
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            def tokenize(batch: List[str]) -> List[List[str]]:
+                shards = [batch[start:end] for start, end in shard_ranges(len(batch), workers * 4)]
+                return [tokens for part in pool.map(self._word_tokenize_many, shards) for tokens in part]
+
+            if budget is None:
+                # Sentence splitting fans out too, one text piece per task
+                parts = pool.map(self._sentence_tokenize, list(_text_pieces(text)))
+                sentences = [sentence for part in parts for sentence in part]
+                return sentences, tokenize(sentences)
+            return self._tokenize_in_rounds(text, tokenize, budget, workers)
+
+    def _tokenize_in_rounds(self, text: str, tokenize: Callable[[List[str]], List[List[str]]],
+                            budget: Optional[LatencyBudget], workers: int) -> Tuple[List[str], List[List[str]]]:
+        if budget is None:
+            sentences = self._sentence_tokenize(text)
+            return sentences, tokenize(sentences)
+        # Sentences are split off a piece of text at a time and tokenized in
+        # batches. Both stop between batches once the tokenization share is
+        # spent; the first batch always runs so there is something to analyse.
+        deadline = budget.deadline(TOKENIZE_SHARE)
+        pending = self._iter_sentences(text)
+        batch_size = SENTENCE_BATCH * workers
+        sentences: List[str] = []
+        tokens_by_sentence: List[List[str]] = []
+        while True:
+            batch = list(islice(pending, batch_size))
+            if not batch:
+                break
+            if tokens_by_sentence and budget.clock() >= deadline:
+                budget.degrade(CAPPED_SENTENCES)
+                break
+            sentences.extend(batch)
+            tokens_by_sentence.extend(tokenize(batch))
+        return sentences, tokens_by_sentence
+
+    def _iter_sentences(self, text: str) -> Iterator[str]:
+        for piece in _text_pieces(text):
+            yield from self._sentence_tokenize(piece)
+
+    def _word_tokenize_many(self, sentences: List[str]) -> List[List[str]]:
+        # Resolve the tokenizer and stop-word set once per batch, not per sentence/token
+        from nltk.tokenize import word_tokenize
+        stop_words = self.stop_words
+        return [self._word_tokenize(s, word_tokenize, stop_words) for s in sentences]
+
     def _sentence_tokenize(self, text: str) -> List[str]:
+        from nltk.tokenize import sent_tokenize
         try:
             sentences = sent_tokenize(text)
             return [s.strip() for s in sentences if s.strip()]
@@ -47,23 +243,30 @@ class TextPreprocessor:
             # Fallback regex split
             return [s.strip() for s in re.split(r"(?<=[.!?])\s+", text) if s.strip()]
 
-    def _word_tokenize(self, sentence: str) -> List[str]:
+    def _word_tokenize(self, sentence: str, word_tokenize=None,
+                       stop_words: Optional[Set[str]] = None) -> List[str]:
+        if word_tokenize is None:
+            from nltk.tokenize import word_tokenize
+        if stop_words is None:
+            stop_words = self.stop_words
         try:
             tokens = word_tokenize(sentence)
         except LookupError:
             tokens = re.findall(r"\b\w+\b", sentence)
         tokens = [t.lower() for t in tokens]
-        tokens = [t for t in tokens if t.isalpha() and t not in self.stop_words]
+        tokens = [t for t in tokens if t.isalpha() and t not in stop_words]
         return tokens
 
     def pos_tag(self, tokens: List[str]) -> List[tuple[str, str]]:
+        import nltk
         try:
             return nltk.pos_tag(tokens)
         except LookupError:
             return [(t, "NN") for t in tokens]
 
     def named_entities(self, text: str) -> List[str]:
-        if self.spacy_nlp is None:
+        nlp = self.spacy_nlp
+        if nlp is None:
             return []
-        doc = self.spacy_nlp(text)
+        doc = nlp(text)
         return list({ent.text for ent in doc.ents})
\ No newline at end of file
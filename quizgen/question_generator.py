@@ -2,12 +2,18 @@ from __future__ import annotations
 
 import random
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 from .answer_generator import AnswerGenerator
+from .budget import POOL_TERM_DISTRACTORS, WORDNET_RESERVE_SECONDS, LatencyBudget
 from .difficulty_assessor import DifficultyAssessor
 from .text_analyzer import Concept
 
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
 
 @dataclass
 class Question:
@@ -21,56 +27,117 @@ class Question:
 
 
 class QuestionGenerator:
-    def __init__(self, random_seed: int = 42) -> None:
-        random.seed(random_seed)
+    def __init__(self, random_seed: int = 42, wordnet_index_path: Optional[str | Path] = None) -> None:
+        self.random_seed = random_seed
+        self.rng = random.Random(random_seed)
         self.difficulty = DifficultyAssessor()
-        self.answers = AnswerGenerator(random_seed=random_seed)
+        self.answers = AnswerGenerator(random_seed=random_seed, wordnet_index_path=wordnet_index_path)
 
-    def create_questions(self, concepts: List[Concept], config) -> List[Question]:
+    def create_questions(self, concepts: List[Concept], config,
+                         budget: Optional[LatencyBudget] = None) -> List[Question]:
         questions: List[Question] = []
         pool_terms = [c.term for c in concepts]
+        plan = [
+            ("mcq", config.num_mcq),
+            ("true_false", config.num_true_false),
+            ("fill_blank", config.num_fill_blank),
+            ("short_answer", config.num_short_answer),
+        ]
+        workers = getattr(config, "parallel_workers", 0)
+        if workers <= 0:
+            for kind, limit in plan:
+                questions.extend(self._collect_serial(kind, limit, concepts, pool_terms, config, budget))
+            return questions
 
-        # MCQ
-        for concept in concepts:
-            if len(questions) >= config.num_mcq:
-                break
-            q = self._make_mcq(concept, pool_terms, config.max_options_per_mcq)
-            if q:
-                questions.append(q)
+        # Imported here: multiprocessing is only worth loading when fanning out
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
-        # True/False
-        tf_count = 0
-        for concept in concepts:
-            if tf_count >= config.num_true_false:
-                break
-            q = self._make_true_false(concept)
-            if q:
-                questions.append(q)
-                tf_count += 1
+        if config.num_mcq > 0:
+            # Load WordNet here, not concurrently from the first worker lookups
+            self.answers.ensure_wordnet_loaded()
+        backend = getattr(config, "parallel_backend", "thread")
+        if backend == "process":
+            executor = ProcessPoolExecutor(max_workers=workers)
+        elif backend == "thread":
+            executor = ThreadPoolExecutor(max_workers=workers)
+        else:
+            raise ValueError(f"Unknown parallel backend: {backend}")
+        with executor:
+            for kind, limit in plan:
+                questions.extend(
+                    self._collect_parallel(kind, limit, concepts, pool_terms, config, executor, workers, budget)
+                )
+        return questions
 
-        # Fill in the blank
-        fb_count = 0
-        for concept in concepts:
-            if fb_count >= config.num_fill_blank:
+    def _collect_serial(self, kind: str, limit: int, concepts: List[Concept],
+                        pool_terms: List[str], config,
+                        budget: Optional[LatencyBudget] = None) -> List[Question]:
+        collected: List[Question] = []
+        for index, concept in enumerate(concepts):
+            if len(collected) >= limit:
                 break
-            q = self._make_fill_blank(concept)
+            q = self._make_question(kind, index, concept, pool_terms, config.max_options_per_mcq, budget)
             if q:
-                questions.append(q)
-                fb_count += 1
+                collected.append(q)
+        return collected
 
-        # Short answer
-        sa_count = 0
-        for concept in concepts:
-            if sa_count >= config.num_short_answer:
-                break
-            q = self._make_short_answer(concept)
-            if q:
-                questions.append(q)
-                sa_count += 1
+    def _collect_parallel(self, kind: str, limit: int, concepts: List[Concept],
+                          pool_terms: List[str], config, executor: Executor,
+                          workers: int, budget: Optional[LatencyBudget] = None) -> List[Question]:
+        if limit <= 0 or not concepts:
+            return []
+        if kind == "mcq" and budget is not None and budget.seconds is not None:
+            # WordNet use is decided per concept against the live clock, which
+            # worker processes cannot share; build these the serial way
+            return self._collect_serial(kind, limit, concepts, pool_terms, config, budget)
+        # Concepts are built in waves, in concept order, until `limit` questions
+        # exist. Each concept has its own RNG, so the result matches the serial
+        # path however the waves fall.
+        make = partial(
+            self._make_question, kind, pool_terms=pool_terms, max_options=config.max_options_per_mcq,
+        )
+        chunksize = max(1, min(limit, len(concepts)) // (workers * 4))
+        collected: List[Question] = []
+        start = 0
+        while start < len(concepts) and len(collected) < limit:
+            # At least what is still missing, and at least one chunk per worker
+            end = start + max(limit - len(collected), workers * chunksize)
+            for q in executor.map(make, range(start, min(end, len(concepts))), concepts[start:end],
+                                  chunksize=chunksize):
+                if q and len(collected) < limit:
+                    collected.append(q)
+            start = end
+        return collected
 
-        return questions
+    def _make_question(self, kind: str, index: int, concept: Concept,
+                       pool_terms: List[str], max_options: int,
+                       budget: Optional[LatencyBudget] = None) -> Optional[Question]:
+        if kind == "mcq":
+            return self._make_mcq(concept, pool_terms, max_options, rng=self._concept_rng(index), budget=budget)
+        if kind == "true_false":
+            return self._make_true_false(concept)
+        if kind == "fill_blank":
+            return self._make_fill_blank(concept)
+        if kind == "short_answer":
+            return self._make_short_answer(concept)
+        raise ValueError(f"Unknown question type: {kind}")
+
+    def _wordnet_allowed(self, budget: Optional[LatencyBudget]) -> bool:
+        # Near the end of the latency budget, distractors come from pool terms only
+        if budget is None or budget.remaining() >= WORDNET_RESERVE_SECONDS:
+            return True
+        budget.degrade(POOL_TERM_DISTRACTORS)
+        return False
+
+    def _concept_rng(self, index: int) -> random.Random:
+        # String seeds hash deterministically (unlike hash()), so the stream for a
+        # given (seed, concept index) is the same in every thread and process
+        return random.Random(f"{self.random_seed}:{index}")
 
-    def _make_mcq(self, concept: Concept, pool_terms: List[str], max_options: int) -> Optional[Question]:
+    def _make_mcq(self, concept: Concept, pool_terms: List[str], max_options: int,
+                  rng: Optional[random.Random] = None,
+                  budget: Optional[LatencyBudget] = None) -> Optional[Question]:
+        rng = rng or self.rng
         sentence = (concept.definition_candidates or concept.supporting_sentences or [""])[0]
         if not sentence:
             return None
@@ -80,11 +147,14 @@ class QuestionGenerator:
         if not correct:
             correct = concept.term
 
+        # The budget only matters (and is only reported) for WordNet lookups
+        use_wordnet = self.answers.uses_wordnet(correct) and self._wordnet_allowed(budget)
         distractors = self.answers.pick_plausible_distractors(
-            correct, pool_terms, concept.named_entities, concept.numerical_facts, max_options
+            correct, pool_terms, concept.named_entities, concept.numerical_facts, max_options, rng=rng,
+            use_wordnet=use_wordnet,
         )
         options = [correct] + distractors
-        random.shuffle(options)
+        rng.shuffle(options)
 
         difficulty = self.difficulty.assess(
             importance_score=concept.importance_score, sentence_length=len(sentence.split())
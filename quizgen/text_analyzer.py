@@ -1,10 +1,25 @@
 from __future__ import annotations
 
+import math
+import pickle
 import re
+import zlib
+from array import array
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from functools import reduce
+from itertools import repeat
+from operator import add, mul
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple, Union
 
-from .nlp_utils import ProcessedText, TextPreprocessor
+from .budget import (
+    ANALYSIS_SHARE,
+    CAPPED_SENTENCES,
+    NER_CHARS_PER_SECOND,
+    SENTENCE_BATCH,
+    SKIPPED_NER,
+    LatencyBudget,
+)
+from .nlp_utils import BIGRAM_SHIFT, InternedText, ProcessedText, TextPreprocessor, pack_bigram, shard_ranges
 
 
 @dataclass
@@ -21,45 +36,63 @@ class ContentAnalyzer:
     def __init__(self, preprocessor: Optional[TextPreprocessor] = None) -> None:
         self.preprocessor = preprocessor or TextPreprocessor()
 
-    def extract_concepts(self, processed: ProcessedText, max_terms: int = 50) -> List[Concept]:
+    def extract_concepts(
+        self, processed: Union[ProcessedText, InternedText], max_terms: int = 50, workers: int = 0,
+        budget: Optional[LatencyBudget] = None,
+    ) -> List[Concept]:
         sentences = processed.sentences
-        documents_tokens = processed.tokens_by_sentence
-        if not documents_tokens:
+        if workers > 0 and len(sentences) > 1:
+            return self._extract_concepts_sharded(processed, max_terms, workers, budget)
+        deadline = budget.deadline(ANALYSIS_SHARE) if budget is not None else None
+        if isinstance(processed, InternedText):
+            term_scores = self._interned_term_scores(processed, max_terms)
+        else:
+            term_scores = self._string_term_scores(processed)
+        if term_scores is None:
             return []
-
-        # Build documents with unigrams + bigrams
-        documents: List[List[str]] = []
-        for tokens in documents_tokens:
-            bigrams = [f"{tokens[i]} {tokens[i+1]}" for i in range(len(tokens) - 1)]
-            documents.append(tokens + bigrams)
-
-        term_scores = self._compute_tfidf_scores(documents)
         # Pick top terms as candidate concepts
         sorted_terms = sorted(term_scores.items(), key=lambda x: x[1], reverse=True)
         top_terms = [t for t, _ in sorted_terms[:max_terms]]
 
         # Map terms to supporting sentences
         term_to_sentences: Dict[str, List[str]] = {t: [] for t in top_terms}
-        for sent in sentences:
+        for idx, sent in enumerate(sentences):
+            if deadline is not None and idx and idx % SENTENCE_BATCH == 0 and budget.clock() >= deadline:
+                # Out of analysis budget: later sentences are not searched
+                budget.degrade(CAPPED_SENTENCES)
+                break
             sent_lower = sent.lower()
             for t in top_terms:
                 if re.search(rf"\b{re.escape(t)}\b", sent_lower):
                     term_to_sentences[t].append(sent)
 
+        supporting: Dict[str, List[str]] = {}
+        definitions: Dict[str, List[str]] = {}
+        for term in top_terms:
+            sents = term_to_sentences.get(term, [])
+            supporting[term] = sents[:5]
+            definitions[term] = [s for s in sents if self._looks_like_definition(term, s)]
+        return self._build_concepts(sentences, top_terms, term_scores, supporting, definitions, budget)
+
+    def _build_concepts(self, sentences: List[str], top_terms: List[str], term_scores: Dict[str, float],
+                        supporting: Dict[str, List[str]], definitions: Dict[str, List[str]],
+                        budget: Optional[LatencyBudget] = None) -> List[Concept]:
         # Extract definitions and numbers
         concept_list: List[Concept] = []
         full_text = " ".join(sentences)
-        named_entities = self.preprocessor.named_entities(full_text)
+        if budget is not None and budget.remaining() < len(full_text) / NER_CHARS_PER_SECOND:
+            budget.degrade(SKIPPED_NER)
+            named_entities: List[str] = []
+        else:
+            named_entities = self.preprocessor.named_entities(full_text)
         numbers = re.findall(r"\b\d+(?:\.\d+)?\b", full_text)
 
         for term in top_terms:
-            sents = term_to_sentences.get(term, [])
-            defs = [s for s in sents if self._looks_like_definition(term, s)]
             concept_list.append(
                 Concept(
                     term=term,
-                    supporting_sentences=sents[:5],
-                    definition_candidates=defs,
+                    supporting_sentences=supporting[term],
+                    definition_candidates=definitions[term],
                     named_entities=named_entities,
                     numerical_facts=numbers,
                     importance_score=term_scores.get(term, 0.0),
@@ -67,7 +100,88 @@ class ContentAnalyzer:
             )
         return concept_list
 
-    def _compute_tfidf_scores(self, documents: List[List[str]]) -> Dict[str, float]:
+    def _extract_concepts_sharded(self, processed: Union[ProcessedText, InternedText], max_terms: int,
+                                  workers: int, budget: Optional[LatencyBudget] = None) -> List[Concept]:
+        # Map: each sentence range yields per-term tf postings, split into term
+        # buckets. Reduce: each bucket's postings are merged in range order and
+        # scored exactly as the serial loop does, and only its top candidates
+        # come back, so the parent just relays bytes and ranks a few terms. The
+        # result is identical to extract_concepts without workers.
+        from concurrent.futures import ProcessPoolExecutor
+
+        sentences = processed.sentences
+        interned = isinstance(processed, InternedText)
+        units = processed.token_ids if interned else processed.tokens_by_sentence
+        if not units:
+            return []
+        ranges = shard_ranges(len(units), workers * 4)
+        deadline = budget.deadline(ANALYSIS_SHARE) if budget is not None else None
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            buckets = len(ranges)
+            parts = list(pool.map(
+                _shard_term_stats, [units[a:b] for a, b in ranges], [interned] * buckets, [buckets] * buckets
+            ))
+            candidates: List[Tuple[Tuple[int, int], Hashable, float]] = []
+            for top in pool.map(
+                _reduce_term_scores, zip(*parts), [len(units)] * buckets, [max_terms] * buckets
+            ):
+                candidates.extend(top)
+            del parts
+            # Ties keep first-appearance order, as the serial dict does
+            candidates.sort(key=lambda c: (-c[2], c[0]))
+            if interned:
+                term_for_key = processed.vocabulary.term_for_key
+                term_scores = {term_for_key(key): score for _, key, score in candidates[:max_terms]}
+            else:
+                term_scores = {term: score for _, term, score in candidates[:max_terms]}
+            top_terms = list(term_scores)
+
+            supporting: Dict[str, List[str]] = {t: [] for t in top_terms}
+            definitions: Dict[str, List[str]] = {t: [] for t in top_terms}
+            # Ranges are searched one batch per worker round so the deadline is
+            # checked between batches, as the serial loop does between sentences
+            for start in range(0, len(ranges), workers):
+                if deadline is not None and start and budget.clock() >= deadline:
+                    # Out of analysis budget: later sentence ranges are not searched
+                    budget.degrade(CAPPED_SENTENCES)
+                    break
+                batch = ranges[start:start + workers]
+                matches = pool.map(
+                    _shard_term_sentences, [sentences[a:b] for a, b in batch], [top_terms] * len(batch)
+                )
+                for shard in matches:
+                    for term, (sents, defs) in zip(top_terms, shard):
+                        supporting[term].extend(sents)
+                        definitions[term].extend(defs)
+        supporting = {t: sents[:5] for t, sents in supporting.items()}
+        return self._build_concepts(sentences, top_terms, term_scores, supporting, definitions, budget)
+
+    def _string_term_scores(self, processed: ProcessedText) -> Optional[Dict[str, float]]:
+        documents_tokens = processed.tokens_by_sentence
+        if not documents_tokens:
+            return None
+
+        # Build documents with unigrams + bigrams
+        documents: List[List[str]] = []
+        for tokens in documents_tokens:
+            bigrams = [f"{tokens[i]} {tokens[i+1]}" for i in range(len(tokens) - 1)]
+            documents.append(tokens + bigrams)
+        return self._compute_tfidf_scores(documents)
+
+    def _interned_term_scores(self, processed: InternedText, max_terms: int) -> Optional[Dict[str, float]]:
+        if not processed.token_ids:
+            return None
+        # Score on int keys (ids and packed bigrams); only the top terms are decoded to strings
+        try:
+            top_keys = _top_interned_keys(processed.token_ids, max_terms)
+        except ImportError:
+            key_scores = self._compute_tfidf_scores(list(processed.term_keys_by_sentence()))
+            top_keys = sorted(key_scores.items(), key=lambda x: x[1], reverse=True)[:max_terms]
+        term_for_key = processed.vocabulary.term_for_key
+        return {term_for_key(key): score for key, score in top_keys}
+
+    def _compute_tfidf_scores(self, documents: Sequence[Sequence[Hashable]]) -> Dict[Hashable, float]:
         # Compute document frequency
         num_docs = len(documents)
         df: Dict[str, int] = {}
@@ -94,7 +208,8 @@ class ContentAnalyzer:
         # Mean across documents
         return {term: total / num_docs for term, total in term_sum_tfidf.items()}
 
-    def _looks_like_definition(self, term: str, sentence: str) -> bool:
+    @staticmethod
+    def _looks_like_definition(term: str, sentence: str) -> bool:
         term_re = re.escape(term)
         patterns = [
             rf"\b{term_re}\s+is\s+(an|a|the)\b",
@@ -102,4 +217,138 @@ class ContentAnalyzer:
             rf"\b{term_re}\s+can\s+be\s+defined\s+as\b",
         ]
         sent_lower = sentence.lower()
-        return any(re.search(p, sent_lower) for p in patterns)
\ No newline at end of file
+        return any(re.search(p, sent_lower) for p in patterns)
+
+
+def _shard_term_stats(units: Sequence, interned: bool, buckets: int) -> List[bytes]:
+    # Sentence-range worker: per term, its tf in each sentence of the range in
+    # order. Terms are split into `buckets` partitions (stable across processes,
+    # unlike hash()), each pickled with the terms' first-seen ordinals in the
+    # range so the parent can pass it on without unpacking it.
+    postings: Dict[Hashable, array] = {}
+    for tokens in units:
+        if interned:
+            doc = list(tokens)
+            doc.extend(pack_bigram(tokens[i], tokens[i + 1]) for i in range(len(tokens) - 1))
+        else:
+            doc = tokens + [f"{tokens[i]} {tokens[i+1]}" for i in range(len(tokens) - 1)]
+        if not doc:
+            continue
+        length = float(len(doc))
+        tf: Dict[Hashable, float] = {}
+        for term in doc:
+            tf[term] = tf.get(term, 0.0) + 1.0 / length
+        for term, tf_val in tf.items():
+            tf_list = postings.get(term)
+            if tf_list is None:
+                tf_list = postings[term] = array("d")
+            tf_list.append(tf_val)
+
+    parts: List[Tuple[Dict[Hashable, array], array]] = [({}, array("q")) for _ in range(buckets)]
+    for ordinal, (term, tf_list) in enumerate(postings.items()):
+        bucket = term % buckets if interned else zlib.crc32(term.encode("utf-8")) % buckets
+        bucket_postings, ordinals = parts[bucket]
+        bucket_postings[term] = tf_list
+        ordinals.append(ordinal)
+    return [pickle.dumps(part, pickle.HIGHEST_PROTOCOL) for part in parts]
+
+
+def _reduce_term_scores(parts: Sequence[bytes], num_docs: int,
+                        max_terms: int) -> List[Tuple[Tuple[int, int], Hashable, float]]:
+    # Term-bucket worker: merges one bucket from every range (in range order)
+    # and returns its top terms as ((range, ordinal) first seen, term, score)
+    postings: Dict[Hashable, List[array]] = {}
+    first_seen: Dict[Hashable, Tuple[int, int]] = {}
+    for shard, blob in enumerate(parts):
+        shard_postings, ordinals = pickle.loads(blob)
+        for (term, tf_list), ordinal in zip(shard_postings.items(), ordinals):
+            tf_lists = postings.get(term)
+            if tf_lists is None:
+                postings[term] = [tf_list]
+                first_seen[term] = (shard, ordinal)
+            else:
+                tf_lists.append(tf_list)
+    scores: Dict[Hashable, float] = {}
+    for term, tf_lists in postings.items():
+        # A term has one posting per sentence containing it, so df is their count
+        df = sum(map(len, tf_lists))
+        idf = 1.0 + math.log((num_docs + 1) / (df + 1))
+        # Left-to-right float additions in sentence order, as in _compute_tfidf_scores
+        total = 0.0
+        for tf_list in tf_lists:
+            total = reduce(add, map(mul, tf_list, repeat(idf)), total)
+        scores[term] = total / num_docs
+    top = sorted(scores.items(), key=lambda x: (-x[1], first_seen[x[0]]))[:max_terms]
+    return [(first_seen[term], term, score) for term, score in top]
+
+
+def _shard_term_sentences(sentences: List[str], top_terms: List[str]) -> List[Tuple[List[str], List[str]]]:
+    # Sentence-range worker: for each term, its first five matching sentences and
+    # every matching sentence that reads like a definition
+    patterns = [re.compile(rf"\b{re.escape(t)}\b") for t in top_terms]
+    matched: List[List[str]] = [[] for _ in top_terms]
+    for sent in sentences:
+        sent_lower = sent.lower()
+        for idx, pattern in enumerate(patterns):
+            if pattern.search(sent_lower):
+                matched[idx].append(sent)
+    return [
+        (sents[:5], [s for s in sents if ContentAnalyzer._looks_like_definition(term, s)])
+        for term, sents in zip(top_terms, matched)
+    ]
+
+
+def _top_interned_keys(token_ids: Sequence[array], max_terms: int) -> List[Tuple[int, float]]:
+    # Vectorised _compute_tfidf_scores over interned sentences. Every float is
+    # produced by the same operations in the same order as the dict-based loop
+    # (tf by repeated 1/len additions, idf via math.log, sums in sentence order
+    # through bincount), and ties keep first-appearance order, so the result
+    # matches the string path bit for bit.
+    import numpy as np
+
+    num_docs = len(token_ids)
+    lengths = np.fromiter((len(ids) for ids in token_ids), dtype=np.int64, count=num_docs)
+    if not lengths.any():
+        return []
+    flat = array("q")
+    for sentence_ids in token_ids:
+        flat.extend(sentence_ids)
+    ids = np.frombuffer(flat, dtype=np.int64)
+    sent = np.repeat(np.arange(num_docs, dtype=np.int64), lengths)
+
+    # Lay keys out in document order (each sentence's unigrams, then its
+    # bigrams) so np.unique's first index is the first appearance
+    doc_lengths = np.maximum(2 * lengths - 1, 0)
+    doc_starts = np.cumsum(doc_lengths) - doc_lengths
+    unigram_at = np.arange(len(ids), dtype=np.int64) + (doc_starts - (np.cumsum(lengths) - lengths))[sent]
+    same_sentence = sent[:-1] == sent[1:]
+    bigram_at = unigram_at[:-1][same_sentence] + lengths[sent[:-1][same_sentence]]
+    del sent
+    keys = np.empty(int(doc_lengths.sum()), dtype=np.int64)
+    keys[unigram_at] = ids
+    keys[bigram_at] = ((ids[:-1][same_sentence] + 1) << BIGRAM_SHIFT) | ids[1:][same_sentence]
+    del unigram_at, bigram_at, same_sentence, ids, flat
+    unique_keys, first_seen, key_index = np.unique(keys, return_index=True, return_inverse=True)
+    del keys
+
+    # One row per (sentence, key), ordered by sentence
+    key_sent = np.repeat(np.arange(num_docs, dtype=np.int64), doc_lengths)
+    pairs, pair_counts = np.unique(key_sent * len(unique_keys) + key_index, return_counts=True)
+    del key_sent, key_index
+    pair_sent, pair_key = np.divmod(pairs, len(unique_keys))
+    del pairs
+    inv_length = 1.0 / doc_lengths[pair_sent].astype(np.float64)
+    tf = np.zeros(len(pair_key))
+    for k in range(1, int(pair_counts.max()) + 1):
+        hit = pair_counts >= k
+        tf[hit] += inv_length[hit]
+
+    df = np.bincount(pair_key, minlength=len(unique_keys))
+    df_values, df_index = np.unique(df, return_inverse=True)
+    idf_values = np.array([1.0 + math.log((num_docs + 1) / (int(d) + 1)) for d in df_values])
+    idf = idf_values[df_index]
+    totals = np.bincount(pair_key, weights=tf * idf[pair_key], minlength=len(unique_keys))
+    scores = totals / num_docs
+
+    order = np.lexsort((first_seen, -scores))[:max_terms]
+    return [(int(unique_keys[i]), float(scores[i])) for i in order]
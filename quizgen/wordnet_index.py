@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, Hashable, Iterator, List, Optional, Sequence, Set, Tuple
+
+# Compact, memory-mapped export of the part of WordNet that distractor
+# generation reads: (pos, lemma) -> synsets -> lemma names, plus the morphy
+# exception lists so lookups resolve inflected forms exactly like
+# `wordnet.synsets`. Opening it costs one mmap instead of parsing the corpus.
+#
+# Layout (little-endian): magic, section count, (offset, size) per section,
+# then the sections, each 4-byte aligned. String tables are uint32 offsets
+# into a UTF-8 blob; posting lists are uint32 offsets into uint32 values.
+
+MAGIC = b"QZWNIDX1"
+POS_LIST = ("n", "v", "a", "r")
+NUM_SECTIONS = 12
+INDEX_PATH_ENV = "QUIZGEN_WORDNET_INDEX"
+_BLOB_SECTIONS = frozenset({1, 7, 9})
+
+# Same rules as nltk.corpus.reader.wordnet.WordNetCorpusReader
+MORPHOLOGICAL_SUBSTITUTIONS = {
+    "n": [
+        ("s", ""),
+        ("ses", "s"),
+        ("ves", "f"),
+        ("xes", "x"),
+        ("zes", "z"),
+        ("ches", "ch"),
+        ("shes", "sh"),
+        ("men", "man"),
+        ("ies", "y"),
+    ],
+    "v": [
+        ("s", ""),
+        ("ies", "y"),
+        ("es", "e"),
+        ("es", ""),
+        ("ed", "e"),
+        ("ed", ""),
+        ("ing", "e"),
+        ("ing", ""),
+    ],
+    "a": [("er", ""), ("est", ""), ("er", "e"), ("est", "e")],
+    "r": [],
+}
+
+
+def default_index_path() -> Path:
+    # $QUIZGEN_WORDNET_INDEX lets read-only installs keep the index elsewhere
+    return Path(os.environ.get(INDEX_PATH_ENV) or Path(__file__).with_name("wordnet_lemmas.idx"))
+
+
+def _key(pos: str, form: str) -> bytes:
+    return f"{pos}:{form}".encode("utf-8")
+
+
+class _StringTable:
+    def __init__(self, offsets: memoryview, blob: memoryview) -> None:
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def raw(self, idx: int) -> bytes:
+        return bytes(self.blob[self.offsets[idx]:self.offsets[idx + 1]])
+
+    def get(self, idx: int) -> str:
+        return self.raw(idx).decode("utf-8")
+
+    def find(self, key: bytes) -> int:
+        # Binary search; only valid for tables written in sorted order
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.raw(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self) and self.raw(lo) == key:
+            return lo
+        return -1
+
+
+class _Postings:
+    def __init__(self, offsets: memoryview, values: memoryview) -> None:
+        self.offsets = offsets
+        self.values = values
+
+    def get(self, idx: int) -> memoryview:
+        return self.values[self.offsets[idx]:self.offsets[idx + 1]]
+
+
+class WordNetIndex:
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        if sys.byteorder != "little":
+            raise ValueError("WordNet index files are little-endian only")
+        with open(self.path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        if bytes(view[: len(MAGIC)]) != MAGIC:
+            raise ValueError(f"Not a WordNet index file: {self.path}")
+        (count,) = struct.unpack_from("<I", view, len(MAGIC))
+        if count != NUM_SECTIONS:
+            raise ValueError(f"Unsupported WordNet index layout: {self.path}")
+        sections = []
+        for i in range(count):
+            offset, size = struct.unpack_from("<II", view, len(MAGIC) + 4 + 8 * i)
+            sections.append(view[offset:offset + size])
+        s = [sec if i in _BLOB_SECTIONS else sec.cast("I") for i, sec in enumerate(sections)]
+        self._lemma_keys = _StringTable(s[0], s[1])
+        self._lemma_synsets = _Postings(s[2], s[3])
+        self._synset_names = _Postings(s[4], s[5])
+        self._names = _StringTable(s[6], s[7])
+        self._exception_keys = _StringTable(s[8], s[9])
+        self._exception_bases = _Postings(s[10], s[11])
+
+    def __reduce__(self):
+        # Reopen by path when pickled into worker processes
+        return (WordNetIndex, (str(self.path),))
+
+    def synset_lemma_names(self, lemma: str) -> Iterator[List[str]]:
+        # Lemma names of each synset, in the order `wordnet.synsets(lemma)` returns them
+        lemma = lemma.lower()
+        for pos in POS_LIST:
+            for form in self._morphy(lemma, pos):
+                entry = self._lemma_keys.find(_key(pos, form))
+                for synset_id in self._lemma_synsets.get(entry):
+                    yield [self._names.get(n) for n in self._synset_names.get(synset_id)]
+
+    def _has_form(self, form: str, pos: str) -> bool:
+        return self._lemma_keys.find(_key(pos, form)) >= 0
+
+    def _morphy(self, form: str, pos: str) -> List[str]:
+        substitutions = MORPHOLOGICAL_SUBSTITUTIONS[pos]
+
+        def apply_rules(forms: List[str]) -> List[str]:
+            return [
+                f[: -len(old)] + new
+                for f in forms
+                for old, new in substitutions
+                if f.endswith(old)
+            ]
+
+        def filter_forms(forms: List[str]) -> List[str]:
+            result: List[str] = []
+            for f in forms:
+                if f not in result and self._has_form(f, pos):
+                    result.append(f)
+            return result
+
+        exception = self._exception_keys.find(_key(pos, form))
+        if exception >= 0:
+            bases = [self._names.get(n) for n in self._exception_bases.get(exception)]
+            return filter_forms([form] + bases)
+
+        forms = apply_rules([form])
+        results = filter_forms([form] + forms)
+        if results:
+            return results
+        while forms:
+            forms = apply_rules(forms)
+            results = filter_forms(forms)
+            if results:
+                return results
+        return []
+
+
+_loaded_indexes: Dict[Path, WordNetIndex] = {}
+# Paths already found absent or unreadable, so lookups do not retry open()
+_missing_indexes: Set[Path] = set()
+
+
+def load_wordnet_index(path: Optional[str | Path] = None) -> Optional[WordNetIndex]:
+    # Opened once per process; None if the file is absent or unreadable
+    path = Path(path) if path is not None else default_index_path()
+    index = _loaded_indexes.get(path)
+    if index is None:
+        if path in _missing_indexes:
+            return None
+        try:
+            index = WordNetIndex(path)
+        except (OSError, ValueError, struct.error):
+            _missing_indexes.add(path)
+            return None
+        _loaded_indexes[path] = index
+    return index
+
+
+def _u32(values: Sequence[int]) -> bytes:
+    data = array("I", values)
+    if sys.byteorder != "little":
+        data.byteswap()
+    return data.tobytes()
+
+
+def _string_table(strings: Sequence[str]) -> Tuple[bytes, bytes]:
+    offsets = [0]
+    blob = bytearray()
+    for s in strings:
+        blob += s.encode("utf-8")
+        offsets.append(len(blob))
+    return _u32(offsets), bytes(blob)
+
+
+def _postings(lists: Sequence[Sequence[int]]) -> Tuple[bytes, bytes]:
+    offsets = [0]
+    values: List[int] = []
+    for items in lists:
+        values.extend(items)
+        offsets.append(len(values))
+    return _u32(offsets), _u32(values)
+
+
+def write_wordnet_index(
+    out_path: str | Path,
+    lemma_synsets: Dict[Tuple[str, str], List[Hashable]],
+    synset_lemmas: Dict[Hashable, List[str]],
+    exceptions: Dict[Tuple[str, str], List[str]],
+) -> Path:
+    # lemma_synsets: (pos, lemma) -> synset keys; synset_lemmas: synset key ->
+    # lemma names; exceptions: (pos, inflected form) -> base forms
+    names = sorted({n for ns in synset_lemmas.values() for n in ns} | {b for bs in exceptions.values() for b in bs})
+    name_ids = {n: i for i, n in enumerate(names)}
+    synset_keys = list(synset_lemmas)
+    synset_ids = {k: i for i, k in enumerate(synset_keys)}
+
+    # Keys are sorted bytewise so lookups can binary-search them
+    lemma_entries = sorted(
+        ((_key(pos, lemma), syns) for (pos, lemma), syns in lemma_synsets.items()), key=lambda e: e[0]
+    )
+    exception_entries = sorted(
+        ((_key(pos, form), bases) for (pos, form), bases in exceptions.items()), key=lambda e: e[0]
+    )
+
+    sections = [
+        *_string_table([k.decode("utf-8") for k, _ in lemma_entries]),
+        *_postings([[synset_ids[s] for s in syns] for _, syns in lemma_entries]),
+        *_postings([[name_ids[n] for n in synset_lemmas[k]] for k in synset_keys]),
+        *_string_table(names),
+        *_string_table([k.decode("utf-8") for k, _ in exception_entries]),
+        *_postings([[name_ids[b] for b in bases] for _, bases in exception_entries]),
+    ]
+
+    header_size = len(MAGIC) + 4 + 8 * len(sections)
+    table = []
+    body = bytearray()
+    offset = header_size
+    for data in sections:
+        padding = -offset % 4
+        body += b"\0" * padding
+        offset += padding
+        table.append((offset, len(data)))
+        body += data
+        offset += len(data)
+
+    out_path = Path(out_path)
+    with open(out_path, "wb") as handle:
+        handle.write(MAGIC)
+        handle.write(struct.pack("<I", len(sections)))
+        for entry in table:
+            handle.write(struct.pack("<II", *entry))
+        handle.write(body)
+    _missing_indexes.discard(out_path)
+    return out_path
+
+
+def build_wordnet_index(out_path: Optional[str | Path] = None, reader=None) -> Path:
+    # Export from an NLTK WordNet corpus reader (default: `nltk.corpus.wordnet`)
+    if reader is None:
+        from nltk.corpus import wordnet as reader
+    reader.ensure_loaded()
+
+    lemma_synsets: Dict[Tuple[str, str], List[Hashable]] = {}
+    synset_lemmas: Dict[Hashable, List[str]] = {}
+    # The reader's own lemma and exception maps are the only way to reproduce
+    # `synsets()` lookups exactly, including the per-pos morphy checks
+    for lemma, pos_offsets in reader._lemma_pos_offset_map.items():
+        for pos in POS_LIST:
+            if pos not in pos_offsets:
+                continue
+            keys = []
+            for offset in pos_offsets[pos]:
+                key = (pos, offset)
+                if key not in synset_lemmas:
+                    synset = reader.synset_from_pos_and_offset(pos, offset)
+                    synset_lemmas[key] = [l.name() for l in synset.lemmas()]
+                keys.append(key)
+            lemma_synsets[(pos, lemma)] = keys
+    exceptions = {
+        (pos, form): list(bases)
+        for pos in POS_LIST
+        for form, bases in reader._exception_map[pos].items()
+    }
+    return write_wordnet_index(out_path or default_index_path(), lemma_synsets, synset_lemmas, exceptions)
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Build the compact WordNet lemma index used for distractors")
+    p.add_argument("--out", type=str, default=str(default_index_path()))
+    args = p.parse_args()
+    out_path = build_wordnet_index(args.out)
+    print(f"Saved WordNet index to: {out_path.resolve()}")
+
+
+if __name__ == "__main__":
+    main()
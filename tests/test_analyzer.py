@@ -1,4 +1,10 @@
+import random
+
+import pytest
+
 from quizgen import TextPreprocessor, ContentAnalyzer
+from quizgen.nlp_utils import ProcessedText
+from quizgen.text_analyzer import _top_interned_keys
 
 
 def test_extract_concepts_basic():
@@ -11,4 +17,71 @@ def test_extract_concepts_basic():
     analyzer = ContentAnalyzer(pre)
     concepts = analyzer.extract_concepts(processed, max_terms=10)
     assert isinstance(concepts, list)
-    assert len(concepts) > 0
\ No newline at end of file
+    assert len(concepts) > 0
+
+
+def test_extract_concepts_interned_matches_strings():
+    text = (
+        "Machine learning is a subset of artificial intelligence. "
+        "Supervised learning uses labeled data. Unsupervised learning finds patterns in data. "
+        "Deep learning is a kind of machine learning."
+    )
+    pre = TextPreprocessor()
+    processed = pre.process(text)
+    interned = pre.process_interned(text)
+    assert interned.tokens_by_sentence == processed.tokens_by_sentence
+
+    analyzer = ContentAnalyzer(pre)
+    expected = analyzer.extract_concepts(processed, max_terms=10)
+    actual = analyzer.extract_concepts(interned, max_terms=10)
+    assert actual == expected
+
+
+def test_extract_concepts_sharded_matches_serial():
+    text = " ".join(
+        f"Cell {i} divides by mitosis. Mitosis is a process of nuclear division. "
+        f"The nucleus refers to the control centre of cell {i}. Ribosomes build proteins from amino acids."
+        for i in range(12)
+    )
+    pre = TextPreprocessor()
+    processed = pre.process(text)
+    assert pre.process(text, workers=2) == processed
+
+    analyzer = ContentAnalyzer(pre)
+    for representation in (processed, pre.process_interned(text, workers=2)):
+        expected = analyzer.extract_concepts(representation, max_terms=15)
+        assert analyzer.extract_concepts(representation, max_terms=15, workers=2) == expected
+
+
+def test_top_interned_keys_matches_dict_scores():
+    pytest.importorskip("numpy")
+    rng = random.Random(7)
+    # A small vocabulary forces repeated terms within sentences and tied scores
+    words = ["alpha", "beta", "gamma", "delta", "omega"]
+    sentences = [[rng.choice(words) for _ in range(rng.randint(0, 6))] for _ in range(60)]
+    interned = ProcessedText(sentences=[" ".join(s) for s in sentences], tokens_by_sentence=sentences).interned()
+
+    analyzer = ContentAnalyzer()
+    scores = analyzer._compute_tfidf_scores(list(interned.term_keys_by_sentence()))
+    expected = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+    assert _top_interned_keys(interned.token_ids, len(expected)) == expected
+    assert _top_interned_keys(interned.token_ids, 3) == expected[:3]
+
+
+def test_sharded_scores_break_ties_like_serial():
+    rng = random.Random(3)
+    words = ["alpha", "beta", "gamma", "delta", "omega", "sigma"]
+    sentences = [[rng.choice(words) for _ in range(rng.randint(0, 5))] for _ in range(80)]
+    processed = ProcessedText(sentences=[" ".join(s) for s in sentences], tokens_by_sentence=sentences)
+
+    analyzer = ContentAnalyzer()
+    for representation in (processed, processed.interned()):
+        expected = analyzer.extract_concepts(representation, max_terms=25)
+        assert analyzer.extract_concepts(representation, max_terms=25, workers=3) == expected
+
+
+def test_parallel_sentence_splitting_matches_serial():
+    # Long enough to be split into several pieces across the pool
+    text = " ".join(f"Enzyme {i} speeds up reaction {i}. Is it reversible? Yes!" for i in range(1500))
+    pre = TextPreprocessor()
+    assert pre.process(text, workers=2) == pre.process(text)
@@ -0,0 +1,149 @@
+import sys
+from contextlib import nullcontext
+from dataclasses import replace
+from itertools import count
+from types import SimpleNamespace
+
+from quizgen import ContentAnalyzer, DocumentProcessor, LatencyBudget, QuestionGenerator, TextPreprocessor
+from quizgen.config import QuizConfig
+
+TEXT = " ".join(
+    f"Mitosis is a process of cell division number {i}. Ribosomes build proteins in cell {i}." for i in range(300)
+)
+
+
+def _expired_budget():
+    # Every clock read advances ten seconds, so the budget runs out immediately
+    ticks = count(0, 10)
+    return LatencyBudget(1.0, clock=lambda: float(next(ticks)))
+
+
+def test_unlimited_budget_changes_nothing():
+    pre = TextPreprocessor()
+    budget = LatencyBudget()
+    processed = pre.process(TEXT, budget=budget)
+    assert processed == pre.process(TEXT)
+    analyzer = ContentAnalyzer(pre)
+    concepts = analyzer.extract_concepts(processed, max_terms=5, budget=budget)
+    assert concepts == analyzer.extract_concepts(processed, max_terms=5)
+    cfg = QuizConfig(num_mcq=2, num_true_false=1, num_fill_blank=1, num_short_answer=1)
+    questions = QuestionGenerator(random_seed=3).create_questions(concepts, cfg, budget=budget)
+    assert questions == QuestionGenerator(random_seed=3).create_questions(concepts, cfg)
+    assert budget.degradations == []
+
+
+def test_expired_budget_degrades_each_stage():
+    pre = TextPreprocessor()
+    budget = _expired_budget()
+    processed = pre.process(TEXT, budget=budget)
+    # One batch of sentences is always kept
+    assert len(processed.sentences) == 256
+
+    concepts = ContentAnalyzer(pre).extract_concepts(processed, max_terms=5, budget=budget)
+    assert concepts and all(c.named_entities == [] for c in concepts)
+
+    cfg = QuizConfig(num_mcq=2, num_true_false=0, num_fill_blank=0, num_short_answer=0)
+    questions = QuestionGenerator(random_seed=3).create_questions(concepts, cfg, budget=budget)
+    pool_terms = {c.term for c in concepts}
+    for q in questions:
+        assert set(q.options) - {q.correct_answer} <= pool_terms
+    assert budget.degradations == ["capped_sentences", "skipped_ner", "pool_term_distractors"]
+
+
+def test_expired_budget_truncates_streamed_extraction(tmp_path):
+    path = tmp_path / "page.html"
+    path.write_text("".join(f"<p>Paragraph {i}.</p>" for i in range(50)), encoding="utf-8")
+    budget = _expired_budget()
+    document = DocumentProcessor().extract_text(path, budget=budget)
+    assert document.text == "Paragraph 0."
+    assert budget.degradations == ["truncated_extraction"]
+
+
+def test_slow_pdf_pages_are_sampled_evenly(monkeypatch):
+    # Stub pdfplumber whose pages each take one second of the fake clock to read
+    now = [0.0]
+
+    def page(i):
+        def extract_text():
+            now[0] += 1.0
+            return f"Page {i} body."
+        return SimpleNamespace(extract_text=extract_text, flush_cache=lambda: None)
+
+    pages = [page(i) for i in range(20)]
+    pdf = SimpleNamespace(pages=pages)
+    monkeypatch.setitem(sys.modules, "pdfplumber", SimpleNamespace(open=lambda path: nullcontext(pdf)))
+
+    budget = LatencyBudget(20.0, clock=lambda: now[0])
+    texts = list(DocumentProcessor().iter_pdf_pages("slides.pdf", budget=budget))
+    # 20 pages at 1 s each do not fit the 6 s extraction share: after the first
+    # page, the rest are read as an evenly spaced sample that does
+    assert texts == [f"Page {i} body." for i in (0, 1, 4, 8, 12, 16)]
+    assert budget.degradations == ["sampled_pages"]
+
+
+def test_parallel_questions_under_budget_match_serial():
+    pre = TextPreprocessor()
+    concepts = ContentAnalyzer(pre).extract_concepts(pre.process(TEXT), max_terms=6)
+
+    def budget():
+        # WordNet is allowed for the first few concepts, then the reserve is hit
+        ticks = count(0, 10)
+        return LatencyBudget(35.0, clock=lambda: float(next(ticks)))
+
+    serial_budget, parallel_budget = budget(), budget()
+    serial_cfg = QuizConfig(num_mcq=5, num_true_false=1, num_fill_blank=0, num_short_answer=0)
+    expected = QuestionGenerator(random_seed=5).create_questions(concepts, serial_cfg, budget=serial_budget)
+    cfg = QuizConfig(num_mcq=5, num_true_false=1, num_fill_blank=0, num_short_answer=0, parallel_workers=2)
+    assert QuestionGenerator(random_seed=5).create_questions(concepts, cfg, budget=parallel_budget) == expected
+    assert parallel_budget.degradations == serial_budget.degradations == ["pool_term_distractors"]
+
+
+def test_expired_budget_caps_sharded_analysis():
+    pre = TextPreprocessor()
+    processed = pre.process(TEXT)
+    budget = _expired_budget()
+    concepts = ContentAnalyzer(pre).extract_concepts(processed, max_terms=5, workers=2, budget=budget)
+    assert concepts and all(c.supporting_sentences for c in concepts)
+    assert budget.degradations == ["capped_sentences", "skipped_ner"]
+
+
+def test_expired_budget_without_wordnet_questions_reports_nothing():
+    pre = TextPreprocessor()
+    concepts = ContentAnalyzer(pre).extract_concepts(pre.process(TEXT), max_terms=5)
+    cfg = QuizConfig(num_mcq=0, num_true_false=2, num_fill_blank=2, num_short_answer=1)
+    budget = _expired_budget()
+    QuestionGenerator(random_seed=3).create_questions(concepts, cfg, budget=budget)
+    assert budget.degradations == []
+
+    # Numeric answers never go through WordNet either
+    numeric = [replace(c, definition_candidates=["42"]) for c in concepts]
+    cfg = QuizConfig(num_mcq=3, num_true_false=0, num_fill_blank=0, num_short_answer=0)
+    QuestionGenerator(random_seed=3).create_questions(numeric, cfg, budget=budget)
+    assert budget.degradations == []
+
+
+def test_expired_budget_bounds_text_reading_and_sentence_splitting(tmp_path, monkeypatch):
+    path = tmp_path / "notes.txt"
+    path.write_text("".join(f"Line {i} is about cells.\n" for i in range(20000)), encoding="utf-8")
+    budget = _expired_budget()
+    document = DocumentProcessor().extract_text(path, budget=budget)
+    # Reading stops after the first chunk and cleanup after its first line
+    assert document.text == "Line 0 is about cells."
+    assert budget.degradations == ["truncated_extraction"]
+
+    pre = TextPreprocessor()
+    text = DocumentProcessor().extract_text(path).text
+    split_lengths = []
+    original = TextPreprocessor._sentence_tokenize
+
+    def record(self, piece):
+        split_lengths.append(len(piece))
+        return original(self, piece)
+
+    monkeypatch.setattr(TextPreprocessor, "_sentence_tokenize", record)
+    budget = _expired_budget()
+    processed = pre.process(text, budget=budget)
+    assert len(processed.sentences) == 256
+    # Only the first piece of the text went through the sentence splitter
+    assert len(split_lengths) == 1 and split_lengths[0] < len(text) // 4
+    assert budget.degradations == ["capped_sentences"]
@@ -0,0 +1,174 @@
+import pytest
+
+from quizgen import DocumentProcessor
+
+HTML_CORPUS = [
+    "<html><head><title>Cells</title><style>p { color: red; }</style></head>"
+    "<body><h1>The Cell</h1><p>A cell is the basic unit of life &amp; structure.</p>"
+    "<script>var x = '<p>not text</p>';</script><p>Mito<b>chondria</b> make ATP&nbsp;energy.</p>"
+    "<!-- a comment --><ul><li>Nucleus</li><li>Ribosome</li></ul></body></html>",
+    "<!DOCTYPE html><div>Photosynthesis converts light\n\n into chemical energy.<br/>"
+    "It occurs in chloroplasts &#8212; mostly in leaves.</div>",
+]
+
+
+def _extract_html_text_bs4(path):
+    # The BeautifulSoup extractor the streaming one replaced, kept as the reference
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(path.read_text(encoding="utf-8", errors="ignore"), "html.parser")
+    for script in soup(["script", "style"]):
+        script.decompose()
+    return soup.get_text(" ")
+
+
+@pytest.mark.parametrize("html", HTML_CORPUS)
+def test_streaming_html_matches_bs4(tmp_path, html):
+    pytest.importorskip("bs4")
+    path = tmp_path / "page.html"
+    path.write_text(html, encoding="utf-8")
+    processor = DocumentProcessor()
+    expected = processor._normalize_whitespace(_extract_html_text_bs4(path))
+    # A tiny chunk size splits tags and entities across feed() calls
+    streamed = " ".join(processor.iter_html_text(path, chunk_size=7))
+    assert processor._normalize_whitespace(streamed) == expected
+    assert processor._normalize_whitespace(processor._extract_html_text(path)) == expected
+
+
+def test_streaming_html_drops_nav(tmp_path):
+    path = tmp_path / "page.html"
+    path.write_text("<nav><a href='/'>Home</a></nav><p>Body text.</p>", encoding="utf-8")
+    assert list(DocumentProcessor().iter_html_text(path)) == ["Body text."]
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        "<nav><ul><li>Home</li></ul><p>Main content body.</p>",
+        "<div><nav><a href='/'>Home</a></div><p>Main content body.</p>",
+        "<nav><h2>Menu</h2><ul><li>Home</li></ul><main>Main content body.</main>",
+    ],
+)
+def test_streaming_html_unclosed_nav(tmp_path, html):
+    path = tmp_path / "page.html"
+    path.write_text(html, encoding="utf-8")
+    assert list(DocumentProcessor().iter_html_text(path)) == ["Main content body."]
+
+
+def test_streaming_html_memory_is_flat_with_unclosed_tags(tmp_path):
+    import tracemalloc
+
+    peaks = []
+    for paragraphs in (8000, 32000):
+        path = tmp_path / f"export{paragraphs}.html"
+        # Unclosed <p> and stray end tags, as exported HTML often has
+        path.write_text("".join(f"<p>Paragraph {i}.</span>" for i in range(paragraphs)), encoding="utf-8")
+        tracemalloc.start()
+        blocks = sum(1 for _ in DocumentProcessor().iter_html_text(path))
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        assert blocks == paragraphs
+    assert peaks[1] < peaks[0] * 1.5
+
+
+def test_docx_includes_tables_in_document_order(tmp_path):
+    docx = pytest.importorskip("docx")
+    document = docx.Document()
+    document.add_paragraph("Lab 1: Titration")
+    table = document.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "Reagent"
+    table.cell(0, 1).text = "Volume"
+    table.cell(1, 0).text = "NaOH"
+    table.cell(1, 1).text = "25 mL"
+    run = document.add_paragraph("Record the\tend point.").add_run()
+    run.add_break()
+    # Tab stops are w:pPr/w:tabs/w:tab elements, not text
+    tabbed = document.add_paragraph("Reagent volume")
+    tabbed.paragraph_format.tab_stops.add_tab_stop(docx.shared.Inches(1))
+    tabbed.paragraph_format.tab_stops.add_tab_stop(docx.shared.Inches(2))
+    path = tmp_path / "manual.docx"
+    document.save(str(path))
+
+    blocks = list(DocumentProcessor().iter_docx_text(path))
+    assert blocks == [
+        "Lab 1: Titration", "Reagent", "Volume", "NaOH", "25 mL", "Record the\tend point.\n", "Reagent volume",
+    ]
+    # Body paragraphs read the same as python-docx's Paragraph.text
+    assert [p.text for p in docx.Document(str(path)).paragraphs] == [blocks[0]] + blocks[-2:]
+
+
+def test_strip_repeated_headers_footers():
+    pages = [
+        f"Intro to Biology - Chapter 2\n{body}\n(c) 2024 State University\nPage {n}"
+        for n, body in enumerate(
+            ["Cells divide by mitosis.", "Meiosis produces gametes.", "DNA replicates first.", "Chapter 2 review."],
+            start=1,
+        )
+    ]
+    # Two-line windows: the header, and the copyright line above the page number
+    text = DocumentProcessor(header_footer_lines=2)._strip_headers_footers(pages)
+    assert text.splitlines() == [
+        "Cells divide by mitosis.",
+        "Meiosis produces gametes.",
+        "DNA replicates first.",
+        "Chapter 2 review.",
+    ]
+
+
+def test_strip_headers_footers_keeps_short_page_bodies():
+    # Slide pages shorter than both windows have no separate header or footer
+    pages = [f"Summary\nKey point {i}" for i in range(6)]
+    text = DocumentProcessor()._strip_headers_footers(pages)
+    assert text.splitlines() == [line for page in pages for line in page.splitlines()]
+
+
+def test_strip_headers_footers_keeps_single_page_lines():
+    text = DocumentProcessor()._strip_headers_footers(["Course title\nBody line.\n12"])
+    assert text.splitlines() == ["Course title", "Body line."]
+
+
+def _write_docx(path, body_xml):
+    import zipfile
+
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+        ' xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006">'
+        f"<w:body>{body_xml}</w:body></w:document>"
+    )
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("word/document.xml", document)
+    return path
+
+
+def _table_xml(rows):
+    cell = '<w:tc><w:tcPr><w:tcW w:w="2000" w:type="dxa"/></w:tcPr><w:p><w:r><w:t>{}</w:t></w:r></w:p></w:tc>'
+    return "<w:tbl>" + "".join(
+        "<w:tr>" + "".join(cell.format(f"r{r}c{c}") for c in range(3)) + "</w:tr>" for r in range(rows)
+    ) + "</w:tbl>"
+
+
+def test_docx_table_memory_is_flat(tmp_path):
+    import tracemalloc
+
+    peaks = []
+    for rows in (500, 4000):
+        path = _write_docx(tmp_path / f"table{rows}.docx", _table_xml(rows))
+        tracemalloc.start()
+        blocks = sum(1 for _ in DocumentProcessor().iter_docx_text(path))
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        assert blocks == rows * 3
+    # Eight times the rows must not mean a bigger partial tree
+    assert peaks[1] < peaks[0] * 1.5
+
+
+def test_docx_alternate_content_read_once(tmp_path):
+    textbox = "<w:txbxContent><w:p><w:r><w:t>Box text</w:t></w:r></w:p></w:txbxContent>"
+    body = (
+        "<w:p><w:r><w:t>Before </w:t></w:r><w:r><mc:AlternateContent>"
+        f"<mc:Choice Requires=\"wps\">{textbox}</mc:Choice><mc:Fallback>{textbox}</mc:Fallback>"
+        "</mc:AlternateContent></w:r><w:r><w:t>after.</w:t></w:r></w:p>"
+    )
+    path = _write_docx(tmp_path / "textbox.docx", body)
+    assert list(DocumentProcessor().iter_docx_text(path)) == ["Box text", "Before after."]
@@ -0,0 +1,43 @@
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Modules that cost seconds to load and must only be imported on first use
+HEAVY_MODULES = ("nltk", "spacy", "bs4", "docx", "pdfplumber", "reportlab", "multiprocessing")
+
+# Generous ceiling for importing the package and resolving every public name;
+# eager NLTK loading alone blows well past it
+IMPORT_BUDGET_US = 150_000
+
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def _importtime(code: str):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            rows.append((match.group(4), int(match.group(2)), len(match.group(3))))
+    return rows
+
+
+def test_package_import_is_light():
+    rows = _importtime("import quizgen; [getattr(quizgen, name) for name in quizgen.__all__]")
+    loaded = {name.split(".")[0] for name, _, _ in rows}
+    assert not loaded.intersection(HEAVY_MODULES)
+
+    # Top-level rows only (the shallowest indent), so nested imports are not counted twice
+    top_level = min(depth for _, _, depth in rows)
+    cost = sum(cumulative for name, cumulative, depth in rows if depth == top_level and name.startswith("quizgen"))
+    assert cost > 0
+    assert cost < IMPORT_BUDGET_US
@@ -21,4 +21,102 @@ def test_generate_questions():
     gen = QuestionGenerator(random_seed=123)
     cfg = QuizConfig(num_mcq=1, num_true_false=1, num_fill_blank=1, num_short_answer=1)
     questions = gen.create_questions(concepts, cfg)
-    assert len(questions) == 4
\ No newline at end of file
+    assert len(questions) == 4
+
+
+def _numeric_concepts():
+    return [
+        Concept(
+            term=f"term {i}",
+            supporting_sentences=[f"Sample {i} has a value of {i * 10} units."],
+            definition_candidates=[str(i * 10)],
+            named_entities=[],
+            numerical_facts=[str(i * 10)],
+            importance_score=0.5,
+        )
+        for i in range(1, 7)
+    ]
+
+
+def test_generate_questions_parallel_matches_serial():
+    concepts = _numeric_concepts()
+    serial_cfg = QuizConfig(num_mcq=4, num_true_false=3, num_fill_blank=3, num_short_answer=2)
+    expected = QuestionGenerator(random_seed=7).create_questions(concepts, serial_cfg)
+
+    # A second generator must not disturb the first one's stream
+    QuestionGenerator(random_seed=99).create_questions(concepts, serial_cfg)
+
+    for backend in ("thread", "process"):
+        cfg = QuizConfig(
+            num_mcq=4, num_true_false=3, num_fill_blank=3, num_short_answer=2,
+            parallel_workers=2, parallel_backend=backend,
+        )
+        assert QuestionGenerator(random_seed=7).create_questions(concepts, cfg) == expected
+
+
+def test_generate_questions_parallel_text_terms_matches_serial(monkeypatch):
+    import threading
+
+    from quizgen.answer_generator import AnswerGenerator
+
+    concepts = [
+        Concept(
+            term=term,
+            supporting_sentences=[f"A {term} is a part of the {other}."],
+            definition_candidates=[],
+            named_entities=["Golgi"],
+            numerical_facts=[],
+            importance_score=0.4,
+        )
+        for term, other in [("cell", "organism"), ("nucleus", "cell"), ("ribosome", "cytoplasm"),
+                            ("membrane", "cell"), ("enzyme", "pathway")]
+    ]
+    serial_cfg = QuizConfig(num_mcq=5, num_true_false=0, num_fill_blank=0, num_short_answer=0)
+    expected = QuestionGenerator(random_seed=11).create_questions(concepts, serial_cfg)
+
+    loaded_in = []
+    original = AnswerGenerator.ensure_wordnet_loaded
+
+    def record(self):
+        loaded_in.append(threading.current_thread())
+        original(self)
+
+    monkeypatch.setattr(AnswerGenerator, "ensure_wordnet_loaded", record)
+    cfg = QuizConfig(num_mcq=5, num_true_false=0, num_fill_blank=0, num_short_answer=0,
+                     parallel_workers=3, parallel_backend="thread")
+    assert QuestionGenerator(random_seed=11).create_questions(concepts, cfg) == expected
+    # WordNet is loaded once, by the calling thread, before the pool starts
+    assert loaded_in == [threading.current_thread()]
+
+
+def test_generate_questions_parallel_builds_only_what_it_needs(monkeypatch):
+    from quizgen.answer_generator import AnswerGenerator
+
+    concepts = [
+        Concept(
+            term=f"organelle {i}",
+            supporting_sentences=[f"Organelle {i} is part of the cell."],
+            definition_candidates=[],
+            named_entities=[],
+            numerical_facts=[],
+            importance_score=0.3,
+        )
+        for i in range(50)
+    ]
+    calls = []
+    original = AnswerGenerator.pick_plausible_distractors
+
+    def count_calls(self, *args, **kwargs):
+        calls.append(args[0])
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(AnswerGenerator, "pick_plausible_distractors", count_calls)
+    serial_cfg = QuizConfig(num_mcq=5, num_true_false=0, num_fill_blank=0, num_short_answer=0)
+    expected = QuestionGenerator(random_seed=2).create_questions(concepts, serial_cfg)
+    assert len(calls) == 5
+
+    calls.clear()
+    cfg = QuizConfig(num_mcq=5, num_true_false=0, num_fill_blank=0, num_short_answer=0,
+                     parallel_workers=2, parallel_backend="thread")
+    assert QuestionGenerator(random_seed=2).create_questions(concepts, cfg) == expected
+    assert len(calls) == 5
@@ -0,0 +1,93 @@
+import pickle
+
+import pytest
+
+from quizgen import AnswerGenerator, QuestionGenerator
+from quizgen.config import QuizConfig
+from quizgen.text_analyzer import Concept
+from quizgen.wordnet_index import INDEX_PATH_ENV, WordNetIndex, load_wordnet_index, write_wordnet_index
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    synset_lemmas = {
+        ("n", 1): ["cell"],
+        ("n", 2): ["cell", "cadre"],
+        ("n", 3): ["mouse"],
+        ("n", 4): ["mouse", "computer_mouse"],
+        ("v", 5): ["cell", "phone"],
+        ("n", 6): ["organelle", "cell_organelle"],
+    }
+    lemma_synsets = {
+        ("n", "cell"): [("n", 1), ("n", 2)],
+        ("v", "cell"): [("v", 5)],
+        ("n", "cadre"): [("n", 2)],
+        ("n", "mouse"): [("n", 3), ("n", 4)],
+        ("n", "computer_mouse"): [("n", 4)],
+        ("n", "organelle"): [("n", 6)],
+        ("n", "cell_organelle"): [("n", 6)],
+        ("v", "phone"): [("v", 5)],
+    }
+    exceptions = {("n", "mice"): ["mouse"]}
+    return write_wordnet_index(tmp_path / "wordnet.idx", lemma_synsets, synset_lemmas, exceptions)
+
+
+def test_lookup_follows_synsets_order_and_morphy(index_path):
+    index = WordNetIndex(index_path)
+    # Nouns before verbs, synsets in index order
+    assert list(index.synset_lemma_names("Cell")) == [["cell"], ["cell", "cadre"], ["cell", "phone"]]
+    # Regular suffix rules and exception lists resolve inflected forms
+    assert list(index.synset_lemma_names("organelles")) == [["organelle", "cell_organelle"]]
+    assert list(index.synset_lemma_names("mice")) == [["mouse"], ["mouse", "computer_mouse"]]
+    assert list(index.synset_lemma_names("ribosome")) == []
+
+
+def test_answer_generator_uses_index(index_path, tmp_path):
+    answers = AnswerGenerator(wordnet_index_path=index_path)
+    assert answers.generate_distractors_from_wordnet("mice") == ["mouse", "computer mouse"]
+    assert pickle.loads(pickle.dumps(answers)).generate_distractors_from_wordnet("cell") == ["cadre", "phone"]
+
+
+def test_missing_index_is_cached(index_path, tmp_path, monkeypatch):
+    missing = tmp_path / "missing.idx"
+    assert load_wordnet_index(missing) is None
+
+    def fail(*args, **kwargs):
+        raise AssertionError("missing index reopened")
+
+    monkeypatch.setattr("quizgen.wordnet_index.WordNetIndex", fail)
+    assert load_wordnet_index(missing) is None
+    monkeypatch.undo()
+
+    # Building the index at that path makes it loadable again
+    write_wordnet_index(missing, {}, {}, {})
+    assert load_wordnet_index(missing) is not None
+
+
+def test_index_matches_nltk(tmp_path):
+    wordnet = pytest.importorskip("nltk.corpus").wordnet
+    try:
+        wordnet.ensure_loaded()
+    except LookupError:
+        pytest.skip("WordNet corpus not installed")
+    from quizgen.wordnet_index import build_wordnet_index
+
+    index = WordNetIndex(build_wordnet_index(tmp_path / "wordnet.idx"))
+    for term in ("cell", "cells", "mice", "running", "better", "photosynthesis", "machine_learning", "quickly"):
+        expected = [[lemma.name() for lemma in syn.lemmas()] for syn in wordnet.synsets(term)]
+        assert list(index.synset_lemma_names(term)) == expected
+
+
+def test_pipeline_uses_configured_index(index_path, monkeypatch):
+    concept = Concept(
+        term="cell", supporting_sentences=["A cell is the unit of life."], definition_candidates=[],
+        named_entities=[], numerical_facts=[], importance_score=0.5,
+    )
+    cfg = QuizConfig(num_mcq=1, num_true_false=0, num_fill_blank=0, num_short_answer=0,
+                     wordnet_index_path=str(index_path))
+    [question] = QuestionGenerator(wordnet_index_path=cfg.wordnet_index_path).create_questions([concept], cfg)
+    assert sorted(question.options) == ["cadre", "cell", "phone"]
+
+    # Without an explicit path, $QUIZGEN_WORDNET_INDEX is the default location
+    monkeypatch.setenv(INDEX_PATH_ENV, str(index_path))
+    assert AnswerGenerator().generate_distractors_from_wordnet("mice") == ["mouse", "computer mouse"]
@@ -10,6 +10,7 @@ import streamlit as st
 from quizgen import (
     ContentAnalyzer,
     DocumentProcessor,
+    LatencyBudget,
     QuizConfig,
     QuizFormatter,
     QuestionGenerator,
@@ -30,6 +31,8 @@ with st.sidebar:
     output_format = st.selectbox("Output format", ["json", "text", "pdf"], index=0)
     seed = st.number_input("Random seed", min_value=0, max_value=999999, value=42)
     include_answers = st.checkbox("Include answers in preview", value=True)
+    time_budget = st.number_input("Time budget in seconds (0 = unlimited)", min_value=0.0, max_value=120.0, value=0.0)
+    wordnet_index = st.text_input("WordNet index path (optional)", value="")
 
 uploaded = st.file_uploader("Upload a document (PDF, DOCX, TXT, HTML)", type=["pdf", "docx", "txt", "html", "htm"]) 
 
@@ -48,20 +51,25 @@ if uploaded is not None:
                 max_options_per_mcq=int(max_opts),
                 output_format=output_format,
                 random_seed=int(seed),
+                time_budget_seconds=float(time_budget) or None,
+                wordnet_index_path=wordnet_index.strip() or None,
             )
 
             processor = DocumentProcessor()
             preprocessor = TextPreprocessor()
             analyzer = ContentAnalyzer(preprocessor)
-            generator = QuestionGenerator(random_seed=int(seed))
+            generator = QuestionGenerator(random_seed=int(seed), wordnet_index_path=config.wordnet_index_path)
             formatter = QuizFormatter()
+            budget = LatencyBudget(config.time_budget_seconds)
 
-            document = processor.extract_text(str(tmp_path))
-            processed = preprocessor.process(document.text)
-            concepts = analyzer.extract_concepts(processed)
-            questions = generator.create_questions(concepts, config)
+            document = processor.extract_text(str(tmp_path), budget=budget)
+            processed = preprocessor.process(document.text, budget=budget)
+            concepts = analyzer.extract_concepts(processed, budget=budget)
+            questions = generator.create_questions(concepts, config, budget=budget)
 
             st.success(f"Generated {len(questions)} questions.")
+            if budget.degradations:
+                st.info(f"Degraded to meet the time budget: {', '.join(budget.degradations)}")
 
             # Preview
             for idx, q in enumerate(questions, start=1):